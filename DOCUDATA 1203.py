@@ -1,6 +1,14 @@
 import streamlit as st
 import json
 
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def load_upload(raw: bytes):
+    """Parse an uploaded JSON file once, returning the data and its lowercased text for substring queries."""
+    data = json.loads(raw)
+    return data, json.dumps(data, indent=2).lower()
+
+
 st.title("JSON-Based Search Website")
 
 st.write("""
@@ -15,7 +23,8 @@ uploaded_file = st.sidebar.file_uploader("Choose a JSON file", type=["json"])
 if uploaded_file is not None:
     try:
         # Load JSON data
-        data = json.load(uploaded_file)
+        raw = uploaded_file.getvalue()
+        data, searchable_text = load_upload(raw)
         st.success("JSON file successfully loaded!")
         
         # Natural language query section
@@ -25,8 +34,7 @@ if uploaded_file is not None:
         if query:
             # For demonstration, we simply search the JSON string for the query substring.
             # More advanced natural language processing can be added here.
-            json_str = json.dumps(data, indent=2)
-            if query.lower() in json_str.lower():
+            if query.lower() in searchable_text:
                 st.write("The query was found in the JSON data.")
                 # Optionally, you could extract and display a snippet of matching content.
             else:
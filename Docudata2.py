@@ -3,9 +3,17 @@ import json
 import re
 from typing import Dict, List, Optional
 import pandas as pd
-import csv
 import io
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+_NUMERIC_SPEC_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(mm|cm|m|ft|in|%|degrees?|MPa|PSI|kN|kPa|m²|m³|ft²|ft³)")
+
 class BuildingCodeAnalyzer:
     def __init__(self):
         self.components = {}
@@ -16,7 +24,7 @@ class BuildingCodeAnalyzer:
     def load_file(self, file_data) -> bool:
         """Load and process JSON data from uploaded file."""
         try:
-            data = json.loads(file_data)
+            data = _json_loads(file_data)
             return self._process_data(data)
         except Exception as e:
             st.error(f"Error loading file: {e}")
@@ -109,10 +117,7 @@ class BuildingCodeAnalyzer:
                     result["guidelines"] = self.guidelines[comp_key]["description"]
                 
                     # Extract numerical specifications from guidelines
-                    numerical_specs = re.findall(
-                        r"(\d+(?:\.\d+)?)\s*(mm|cm|m|ft|in|%|degrees?|MPa|PSI|kN|kPa|m²|m³|ft²|ft³)", 
-                        str(self.guidelines[comp_key])
-                    )
+                    numerical_specs = _NUMERIC_SPEC_RE.findall(str(self.guidelines[comp_key]))
                     if numerical_specs:
                         result["specifications"] = [
                             {"value": float(value), "unit": unit}
@@ -130,26 +135,26 @@ def export_results(results: List[Dict], format: str) -> Optional[tuple]:
     
     if format == "CSV":
         output = io.StringIO()
-        writer = csv.writer(output)
-        # Write headers
         headers = ["Component", "Type", "Quantity", "Unit", "Guidelines", "Specifications"]
-        writer.writerow(headers)
-        
-        # Write data
-        for result in results:
-            row = [
+        rows = [
+            (
                 result["component"],
                 result["type"],
                 result.get("quantity", {}).get("value", ""),
                 result.get("quantity", {}).get("unit", ""),
                 result.get("guidelines", ""),
                 ", ".join([f"{s['value']} {s['unit']}" for s in result.get("specifications", [])])
-            ]
-            writer.writerow(row)
+            )
+            for result in results
+        ]
+        # object dtype keeps integer quantities from being written as floats
+        pd.DataFrame(rows, columns=headers, dtype=object).to_csv(output, index=False, lineterminator="\r\n")
         
         return output.getvalue(), "text/csv"
     
     elif format == "JSON":
+        if orjson is not None:
+            return orjson.dumps(results, option=orjson.OPT_INDENT_2), "application/json"
         return json.dumps(results, indent=2), "application/json"
     
     return None
@@ -223,8 +228,7 @@ def main():
         uploaded_file = st.file_uploader("Choose a JSON file", type="json")
         
         if uploaded_file:
-            file_contents = uploaded_file.read().decode("utf-8")
-            if st.session_state.analyzer.load_file(file_contents):
+            if st.session_state.analyzer.load_file(uploaded_file.getvalue()):
                 st.success("File loaded successfully!")
                 st.rerun()
 
@@ -3,10 +3,11 @@ import json
 import re
 from collections import defaultdict
 
+_MEASUREMENT_RE = re.compile(r'(\d+(?:\.\d+)?)\s*(mm|m|cm|inches|ft|MPa|dB|hours?|Pa|L/s/m²)')
+
 def extract_measurements(text):
     """Extract measurements with their units."""
-    pattern = r'(\d+(?:\.\d+)?)\s*(mm|m|cm|inches|ft|MPa|dB|hours?|Pa|L/s/m²)'
-    return re.findall(pattern, text)
+    return _MEASUREMENT_RE.findall(text)
 
 def extract_component_data(data, query_terms):
     """Extract relevant component data based on query terms."""
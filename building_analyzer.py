@@ -4,126 +4,180 @@ import json
 import os
 from typing import Dict, List, Any
 import spacy
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
+from spacy.lang.en.stop_words import STOP_WORDS
 import re
+from functools import lru_cache
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# NLTK is imported on first use: nothing in a query reads the stopwords or the
+# lemmatizer, so loading it at startup only slowed the app's cold start
+@st.cache_resource(show_spinner=False)
+def download_nltk_data():
+    """Probe for the required NLTK data, downloading what is missing, once per process."""
+    import nltk
+    try:
+        nltk.data.find('corpora/stopwords')
+        nltk.data.find('taggers/averaged_perceptron_tagger')
+        nltk.data.find('corpora/wordnet')
+    except LookupError:
+        nltk.download('stopwords')
+        nltk.download('averaged_perceptron_tagger')
+        nltk.download('wordnet')
+
+@st.cache_resource(show_spinner=False)
+def english_stopwords() -> frozenset:
+    """Load the NLTK English stopword list once per process."""
+    download_nltk_data()
+    from nltk.corpus import stopwords
+    try:
+        return frozenset(stopwords.words('english'))
+    except LookupError:
+        # Without the corpus, spaCy's list is cached instead of re-raising on every analyzer
+        return frozenset(STOP_WORDS)
+
+@st.cache_resource(show_spinner=False)
+def wordnet_lemmatizer():
+    """Create the NLTK WordNet lemmatizer once per process."""
+    download_nltk_data()
+    from nltk.stem import WordNetLemmatizer
+    return WordNetLemmatizer()
+
+@lru_cache(maxsize=None)
+def requirement_threshold(requirement: str) -> float:
+    """Parse the leading number of a requirement such as "36 inches" once per requirement string."""
+    return float(requirement.split()[0])
+
+# Factor converting each measurement unit to inches, the standard unit for comparisons
+INCHES_PER_UNIT = {
+    'inches': 1,
+    'inch': 1,
+    'in': 1,
+    'feet': 12,
+    'ft': 12,
+    'meters': 39.37,
+    'm': 39.37
+}
+
+# Domain-specific terms for the NLP matcher
+COMPONENT_TERMS = {
+    "wall": ["wall", "partition", "barrier"],
+    "door": ["door", "entrance", "exit", "doorway"],
+    "window": ["window", "opening", "glazing"],
+    "stair": ["stair", "stairway", "staircase", "steps"],
+    "structural": ["load-bearing", "structural", "supporting"],
+    "fire": ["fire-rated", "fire-resistant", "fireproof"],
+    "dimension": ["width", "height", "thickness", "length", "depth"],
+    "material": ["concrete", "steel", "wood", "glass", "metal"],
+    "rating": ["rating", "grade", "class", "performance"],
+    "compliance": ["compliant", "complies", "meets", "satisfies"]
+}
+
+# Building code editions by jurisdiction
+BUILDING_CODES = {
+    "California": {
+        "version": "2022 California Building Code",
+        "jurisdiction": "California Building Standards Commission"
+    },
+    "New York": {
+        "version": "2022 NYC Building Code",
+        "jurisdiction": "NYC Department of Buildings"
+    },
+    "Texas": {
+        "version": "2021 International Building Code with Texas Amendments",
+        "jurisdiction": "Texas Department of Licensing and Regulation"
+    }
+}
+
+# Standard component requirements
+COMPONENT_REQUIREMENTS = {
+    "walls": {
+        "structural": {
+            "min_thickness": "8 inches for concrete, 6 inches for CMU",
+            "reinforcement": "As per structural calculations",
+            "fire_rating": "2-4 hours depending on occupancy",
+            "references": ["CBC Chapter 19", "ACI 318-19"]
+        },
+        "partition": {
+            "min_thickness": "4 inches",
+            "sound_rating": "STC 50 between units",
+            "fire_rating": "1-2 hours depending on location",
+            "references": ["CBC Section 708", "ASTM E90"]
+        }
+    },
+    "doors": {
+        "exterior": {
+            "min_width": "36 inches",
+            "min_height": "80 inches",
+            "fire_rating": "90 minutes for exits",
+            "references": ["CBC Section 1010"]
+        },
+        "interior": {
+            "min_width": "32 inches",
+            "min_height": "80 inches",
+            "accessibility": "ADA compliant hardware",
+            "references": ["CBC Chapter 11B"]
+        }
+    },
+    "windows": {
+        "egress": {
+            "min_width": "20 inches",
+            "min_height": "24 inches",
+            "min_area": "5.7 sq ft",
+            "max_sill_height": "44 inches",
+            "references": ["CBC Section 1030"]
+        },
+        "non_egress": {
+            "glazing": "Safety glazing required in hazardous locations",
+            "energy": "U-factor ≤ 0.30, SHGC ≤ 0.23",
+            "references": ["CBC Section 2406", "Energy Code"]
+        }
+    },
+    "stairs": {
+        "public": {
+            "min_width": "44 inches",
+            "riser_height": "4-7 inches",
+            "tread_depth": "11 inches minimum",
+            "headroom": "80 inches minimum",
+            "references": ["CBC Section 1011"]
+        },
+        "private": {
+            "min_width": "36 inches",
+            "riser_height": "4-7.75 inches",
+            "tread_depth": "10 inches minimum",
+            "references": ["CBC Section 1011.5"]
+        }
+    }
+}
 
 class BuildingAnalyzer:
     def __init__(self):
-        # Download required NLTK data
+        # Load spaCy model; queries only read lemmas, POS tags and numbers, so the
+        # parser and entity recognizer are not run on them
         try:
-            nltk.data.find('tokenizers/punkt')
-            nltk.data.find('corpora/stopwords')
-            nltk.data.find('averaged_perceptron_tagger')
-            nltk.data.find('wordnet')
-        except LookupError:
-            nltk.download('punkt')
-            nltk.download('stopwords')
-            nltk.download('averaged_perceptron_tagger')
-            nltk.download('wordnet')
-        
-        # Load spaCy model
-        try:
-            self.nlp = spacy.load('en_core_web_sm')
+            self.nlp = spacy.load('en_core_web_sm', exclude=["parser", "ner"])
         except:
             os.system('python -m spacy download en_core_web_sm')
-            self.nlp = spacy.load('en_core_web_sm')
+            self.nlp = spacy.load('en_core_web_sm', exclude=["parser", "ner"])
         
-        self.lemmatizer = WordNetLemmatizer()
-        self.stop_words = set(stopwords.words('english'))
-        
-        # Add domain-specific terms to NLP
-        self.component_terms = {
-            "wall": ["wall", "partition", "barrier"],
-            "door": ["door", "entrance", "exit", "doorway"],
-            "window": ["window", "opening", "glazing"],
-            "stair": ["stair", "stairway", "staircase", "steps"],
-            "structural": ["load-bearing", "structural", "supporting"],
-            "fire": ["fire-rated", "fire-resistant", "fireproof"],
-            "dimension": ["width", "height", "thickness", "length", "depth"],
-            "material": ["concrete", "steel", "wood", "glass", "metal"],
-            "rating": ["rating", "grade", "class", "performance"],
-            "compliance": ["compliant", "complies", "meets", "satisfies"]
-        }
-        
-        # Initialize existing attributes
-        self.building_codes = {
-            "California": {
-                "version": "2022 California Building Code",
-                "jurisdiction": "California Building Standards Commission"
-            },
-            "New York": {
-                "version": "2022 NYC Building Code",
-                "jurisdiction": "NYC Department of Buildings"
-            },
-            "Texas": {
-                "version": "2021 International Building Code with Texas Amendments",
-                "jurisdiction": "Texas Department of Licensing and Regulation"
-            }
-        }
-        
-        # Standard component requirements
-        self.component_requirements = {
-            "walls": {
-                "structural": {
-                    "min_thickness": "8 inches for concrete, 6 inches for CMU",
-                    "reinforcement": "As per structural calculations",
-                    "fire_rating": "2-4 hours depending on occupancy",
-                    "references": ["CBC Chapter 19", "ACI 318-19"]
-                },
-                "partition": {
-                    "min_thickness": "4 inches",
-                    "sound_rating": "STC 50 between units",
-                    "fire_rating": "1-2 hours depending on location",
-                    "references": ["CBC Section 708", "ASTM E90"]
-                }
-            },
-            "doors": {
-                "exterior": {
-                    "min_width": "36 inches",
-                    "min_height": "80 inches",
-                    "fire_rating": "90 minutes for exits",
-                    "references": ["CBC Section 1010"]
-                },
-                "interior": {
-                    "min_width": "32 inches",
-                    "min_height": "80 inches",
-                    "accessibility": "ADA compliant hardware",
-                    "references": ["CBC Chapter 11B"]
-                }
-            },
-            "windows": {
-                "egress": {
-                    "min_width": "20 inches",
-                    "min_height": "24 inches",
-                    "min_area": "5.7 sq ft",
-                    "max_sill_height": "44 inches",
-                    "references": ["CBC Section 1030"]
-                },
-                "non_egress": {
-                    "glazing": "Safety glazing required in hazardous locations",
-                    "energy": "U-factor ≤ 0.30, SHGC ≤ 0.23",
-                    "references": ["CBC Section 2406", "Energy Code"]
-                }
-            },
-            "stairs": {
-                "public": {
-                    "min_width": "44 inches",
-                    "riser_height": "4-7 inches",
-                    "tread_depth": "11 inches minimum",
-                    "headroom": "80 inches minimum",
-                    "references": ["CBC Section 1011"]
-                },
-                "private": {
-                    "min_width": "36 inches",
-                    "riser_height": "4-7.75 inches",
-                    "tread_depth": "10 inches minimum",
-                    "references": ["CBC Section 1011.5"]
-                }
-            }
-        }
+        # Shared module tables, bound by reference rather than rebuilt per instance
+        self.component_terms = COMPONENT_TERMS
+        self.building_codes = BUILDING_CODES
+        self.component_requirements = COMPONENT_REQUIREMENTS
+
+    @property
+    def lemmatizer(self):
+        """WordNet lemmatizer, loaded with NLTK on first access."""
+        return wordnet_lemmatizer()
+
+    @property
+    def stop_words(self) -> frozenset:
+        """English stopwords, loaded with NLTK on first access."""
+        return english_stopwords()
 
     def analyze_file(self, file_data: Dict) -> Dict[str, Any]:
         """Analyze uploaded building data and return compliance results"""
@@ -183,20 +237,16 @@ class BuildingAnalyzer:
         # Convert string measurements to numbers for comparison
         if isinstance(value, (int, float)) and isinstance(requirement, str):
             if "inches" in requirement:
-                req_value = float(requirement.split()[0])
-                return value >= req_value
+                return value >= requirement_threshold(requirement)
             elif "sq ft" in requirement:
-                req_value = float(requirement.split()[0])
-                return value >= req_value
+                return value >= requirement_threshold(requirement)
         
         # Handle string requirements
         if isinstance(value, str) and isinstance(requirement, str):
             if "minimum" in requirement.lower():
-                req_value = requirement.split()[0]
-                return float(value) >= float(req_value)
+                return float(value) >= requirement_threshold(requirement)
             elif "maximum" in requirement.lower():
-                req_value = requirement.split()[0]
-                return float(value) <= float(req_value)
+                return float(value) <= requirement_threshold(requirement)
         
         # Default comparison
         return str(value) == str(requirement)
@@ -306,16 +356,7 @@ class BuildingAnalyzer:
     
     def _convert_units(self, value: float, unit: str) -> float:
         """Convert measurements to standard units"""
-        conversions = {
-            'inches': 1,
-            'inch': 1,
-            'in': 1,
-            'feet': 12,
-            'ft': 12,
-            'meters': 39.37,
-            'm': 39.37
-        }
-        return value * conversions.get(unit, 1)
+        return value * INCHES_PER_UNIT.get(unit, 1)
     
     def _get_match_details(self, component: Dict, properties: List[str],
                           measurements: List[Dict], comparisons: List[Dict]) -> Dict:
@@ -370,7 +411,7 @@ def main():
     
     if uploaded_file:
         try:
-            data = json.load(uploaded_file)
+            data = _json_loads(uploaded_file.getvalue())
             st.session_state.uploaded_data = data
             
             # Display raw data in expandable section
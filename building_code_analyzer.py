@@ -1,15 +1,372 @@
 import streamlit as st
 import json
 import re
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import pandas as pd
-import csv
-import io
 import time
-from difflib import get_close_matches
+from rapidfuzz import process
+from rapidfuzz.distance import DamerauLevenshtein
+from functools import lru_cache
+from collections import defaultdict
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 import os
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_loads(data):
+        """json.loads that also takes a memoryview, such as an upload's getbuffer()."""
+        return json.loads(data.tobytes() if isinstance(data, memoryview) else data)
+
+# Word tokens used by the component search index
+_TOKEN_RE = re.compile(r"\w+")
+
+# Keyword patterns used to classify components from their keys
+_STRUCTURAL_RE = re.compile(r"wall|beam|column|foundation|roof|floor|ceiling")
+_UTILITIES_RE = re.compile(r"electrical|plumbing|hvac|mechanical|utility")
+_ARCHITECTURAL_RE = re.compile(r"door|window|stairs|elevator")
+_SAFETY_RE = re.compile(r"fire|safety|emergency|exit")
+
+# Numbers with units plus material, placement and requirement keywords, matched in a
+# single pass. The unit sits in a lookahead and keywords match zero-width so that
+# overlapping matches (e.g. "3 mounted") are all found.
+_DETAIL_RE = re.compile(
+    r"(?P<num>\d+(?:\.\d+)?)(?=\s*(?P<unit>mm|cm|m|ft|in|%|degrees?|MPa|PSI|kN|kPa|m²|m³|ft²|ft³|kW|A))"
+    r"|(?i:(?=(?P<mat>concrete|steel|timber|wood|brick|metal|aluminum|copper|pvc|glass|plasterboard|insulation)"
+    r"|(?P<place>located|installed|mounted|positioned|placed|between|above|below|near|adjacent|inside|outside|centers)"
+    r"|(?P<req>required|minimum|maximum|must|shall|should|need|necessary|mandatory|essential)))"
+)
+_DETAIL_GROUPS = {"mat": "materials", "place": "placement", "req": "requirements"}
+_SENTENCE_RE = re.compile(r"[^.]+")
+# Sentence boundaries used when quoting guideline sentences in search results
+_SENTENCE_SPLIT_RE = re.compile(r"[.!?]+")
+
+# Question phrasing stripped from natural-language searches
+_QUESTION_PHRASE_RE = re.compile(r'\b(i want to know|tell me|what is|show me|the)\b')
+
+# Numbers followed by a unit, as quoted in guidelines and building codes
+_NUMERIC_SPEC_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(mm|cm|m|ft|in|%|degrees?|MPa|PSI|kN|kPa|m²|m³|ft²|ft³|kW|A)")
+
+def _typo_similarity(word: str, term: str, **kwargs) -> float:
+    """Damerau-Levenshtein similarity of a query word to a term, 0 when one is a prefix of the other."""
+    # A prefix is an inflection or a different word ("based", "doorway"), not a typo
+    if word.startswith(term) or term.startswith(word):
+        return 0.0
+    return DamerauLevenshtein.normalized_similarity(word, term, **kwargs)
+
+@lru_cache(maxsize=4096)
+def _classify_component(key: str) -> str:
+    """Classify a component key; cached since the same keys recur across searches."""
+    key_lower = key.lower()
+    if _STRUCTURAL_RE.search(key_lower):
+        return "Structural"
+    if _UTILITIES_RE.search(key_lower):
+        return "Utilities"
+    if _ARCHITECTURAL_RE.search(key_lower):
+        return "Architectural"
+    if _SAFETY_RE.search(key_lower):
+        return "Safety"
+    return "General"
+
+@lru_cache(maxsize=4096)
+def _parse_numeric_specs(text: str) -> tuple:
+    """Return the (value, unit) pairs quoted in a text; cached since searches rescan the same guidelines."""
+    return tuple((float(value), unit) for value, unit in _NUMERIC_SPEC_RE.findall(text))
+
+def _read_json_file(file_path: str):
+    """Parse one JSON file, returning (data, None) or (None, error)."""
+    try:
+        with open(file_path, 'rb') as f:
+            return _json_loads(f.read()), None
+    except Exception as e:
+        return None, e
+
+def _load_json_files(file_paths: List[str]) -> List[tuple]:
+    """Read JSON files on a thread pool so their disk reads overlap; results keep input order."""
+    if len(file_paths) < 2:
+        return [_read_json_file(file_path) for file_path in file_paths]
+    with ThreadPoolExecutor(max_workers=min(8, len(file_paths))) as pool:
+        return list(pool.map(_read_json_file, file_paths))
+
+def _json_directory_signature(directory: str) -> tuple:
+    """Return (filename, mtime) for each JSON file in a directory, used as a cache key."""
+    return tuple(
+        (filename, os.path.getmtime(os.path.join(directory, filename)))
+        for filename in os.listdir(directory) if filename.endswith('.json')
+    )
+
+# File path -> (mtime, (data, error)), shared by every session in the process
+_json_file_cache: Dict[str, tuple] = {}
+
+def _load_json_directory(directory: str, signature: tuple) -> tuple:
+    """Parse the JSON files named in `signature`; only files added or modified since the last call are read."""
+    paths = {filename: os.path.join(directory, filename) for filename, _ in signature}
+    stale = [
+        (filename, mtime) for filename, mtime in signature
+        if _json_file_cache.get(paths[filename], (None,))[0] != mtime
+    ]
+    for (filename, mtime), loaded in zip(stale, _load_json_files([paths[filename] for filename, _ in stale])):
+        _json_file_cache[paths[filename]] = (mtime, loaded)
+    return tuple((filename, _json_file_cache[paths[filename]][1]) for filename, _ in signature)
+
+def _iter_sample_requirements(data):
+    """Yield "- key: value" lines for nested sections that mention requirements, in document order."""
+    if not isinstance(data, dict):
+        return
+    stack = [iter(data.items())]
+    while stack:
+        entry = next(stack[-1], None)
+        if entry is None:
+            stack.pop()
+            continue
+        key, value = entry
+        if isinstance(value, dict):
+            text = str(value)
+            text_lower = text.lower()
+            if "requirement" in text_lower or "minimum" in text_lower:
+                yield f"- {key}: {text}"
+            stack.append(iter(value.items()))
+
+def _iter_children(node, path: str, context: str):
+    """Iterate (key, value, path, context) for the entries of a JSON dict or list.
+
+    List items are yielded with a key of None and keep their parent's context.
+    """
+    if isinstance(node, dict):
+        return (
+            (key, value, path + "." + key if path else key, context + " - " + key if context else key)
+            for key, value in node.items()
+        )
+    if isinstance(node, list):
+        return ((None, item, f"{path}[{i}]", context) for i, item in enumerate(node))
+    return iter(())
+
 class BuildingCodeAnalyzer:
+    # Component categories searched in the building codes, with their related terms
+    COMPONENT_CATEGORIES = {
+        "wall": {
+            "terms": ["wall", "partition", "barrier", "enclosure"],
+            "types": ["exterior", "interior", "fire", "load-bearing", "non-load-bearing", "shear"],
+            "properties": ["height", "thickness", "width", "fire-rating", "insulation", "structural"]
+        },
+        "door": {
+            "terms": ["door", "doorway", "entrance", "exit"],
+            "types": ["exterior", "interior", "fire", "emergency", "sliding", "revolving"],
+            "properties": ["width", "height", "clearance", "fire-rating", "accessibility"]
+        },
+        "window": {
+            "terms": ["window", "glazing", "opening"],
+            "types": ["exterior", "interior", "emergency", "fixed", "operable"],
+            "properties": ["width", "height", "sill-height", "glazing-area", "ventilation"]
+        },
+        "foundation": {
+            "terms": ["foundation", "footing", "base", "substructure"],
+            "types": ["strip", "pad", "raft", "pile", "shallow", "deep"],
+            "properties": ["depth", "width", "bearing-capacity", "reinforcement"]
+        }
+    }
+
+    # Category terms normalized once for fuzzy lookup, with the category each belongs to
+    _COMPONENT_TERMS = tuple(
+        term.strip().lower() for info in COMPONENT_CATEGORIES.values() for term in info["terms"]
+    )
+    _COMPONENT_TERM_CATEGORIES = tuple(
+        category for category, info in COMPONENT_CATEGORIES.items() for _ in info["terms"]
+    )
+    _COMPONENT_TERM_INDEX = dict(zip(_COMPONENT_TERMS, _COMPONENT_TERM_CATEGORIES))
+    # Terms long enough for a single edit to be read as a typo; one edit turns a
+    # four-letter term such as "exit" into an unrelated word such as "exist"
+    _FUZZY_TERMS = tuple(term for term in _COMPONENT_TERMS if len(term) >= 5)
+    _FUZZY_TERM_CATEGORIES = tuple(map(_COMPONENT_TERM_INDEX.__getitem__, _FUZZY_TERMS))
+    # One alternation per category, matching wherever any of its terms occurs
+    _COMPONENT_CATEGORY_RES = {
+        category: re.compile("|".join(map(re.escape, info["terms"])))
+        for category, info in COMPONENT_CATEGORIES.items()
+    }
+
+    # Keyword tables shared by every search call
+    _DIMENSION_PROPS = frozenset({"thickness", "height", "width", "depth", "area"})
+    _LINEAR_PROPS = frozenset({"thickness", "height", "width", "depth"})
+    _LENGTH_UNITS = frozenset({"mm", "cm", "m", "ft", "in"})
+    _STRENGTH_UNITS = frozenset({"MPa", "PSI", "kN", "kPa"})
+    _MANDATORY_TERMS = frozenset({"must", "required", "shall"})
+    _REQUIREMENT_WORDS_RE = re.compile(r"must|shall|should|require|minimum|maximum")
+    _MANDATORY_WORDS_RE = re.compile(r"must|shall|require")
+    _REQUIREMENT_TERMS = ("requirement", "required", "must be", "should be", "minimum", "maximum", "at least", "no more than")
+    _PLACEMENT_TERMS = ("located", "installed", "mounted", "positioned", "placed", "between", "above", "below", "adjacent")
+    _REQUIREMENT_CATEGORIES = (
+        ("Dimensional", re.compile(r"height|width|thickness|dimension")),
+        ("Safety", re.compile(r"fire|safety|emergency|protection")),
+        ("Material", re.compile(r"material|concrete|steel|wood")),
+        ("Construction", re.compile(r"install|construct|build|place")),
+        ("Structural", re.compile(r"load|strength|capacity|structural")),
+    )
+
+    # IFC entity reference data, shared by all analyzer instances
+    IFC_DATABASE = {
+        # Structural Elements
+        "IfcFooting": {
+            "name": "Foundation",
+            "type": "Structural",
+            "description": "Building foundation element",
+            "properties": {
+                "dimensions": ["depth", "width", "length"],
+                "materials": ["concrete", "steel reinforcement"],
+                "requirements": ["minimum depth", "bearing capacity"]
+            }
+        },
+        "IfcWall": {
+            "name": "Wall",
+            "type": "Structural",
+            "description": "Vertical building element",
+            "properties": {
+                "dimensions": ["height", "thickness", "length"],
+                "materials": ["brick", "concrete", "steel", "timber"],
+                "requirements": ["fire rating", "thermal resistance"]
+            }
+        },
+        "IfcBeam": {
+            "name": "Beam",
+            "type": "Structural",
+            "description": "Horizontal structural element",
+            "properties": {
+                "dimensions": ["span", "depth", "width"],
+                "materials": ["steel", "concrete", "timber"],
+                "requirements": ["load capacity", "deflection limits"]
+            }
+        },
+        "IfcColumn": {
+            "name": "Column",
+            "type": "Structural",
+            "description": "Vertical structural element",
+            "properties": {
+                "dimensions": ["height", "width", "depth"],
+                "materials": ["concrete", "steel", "timber"],
+                "requirements": ["axial load capacity", "buckling resistance"]
+            }
+        },
+        # Building Services
+        "IfcElectricalCircuit": {
+            "name": "Electrical Circuit",
+            "type": "Services",
+            "description": "Electrical distribution system",
+            "properties": {
+                "specifications": ["voltage", "current", "power"],
+                "requirements": ["circuit protection", "wire size"]
+            }
+        },
+        "IfcDistributionSystem": {
+            "name": "Distribution System",
+            "type": "Services",
+            "description": "Building service distribution system",
+            "properties": {
+                "specifications": ["flow rate", "pressure"],
+                "requirements": ["insulation", "accessibility"]
+            }
+        },
+        # Space Elements
+        "IfcSpace": {
+            "name": "Room",
+            "type": "Space",
+            "description": "Occupiable space",
+            "properties": {
+                "dimensions": ["area", "height"],
+                "requirements": ["ventilation", "lighting"]
+            }
+        },
+        "IfcBuildingStorey": {
+            "name": "Floor",
+            "type": "Space",
+            "description": "Building floor level",
+            "properties": {
+                "dimensions": ["height", "area"],
+                "requirements": ["fire separation", "accessibility"]
+            }
+        }
+    }
+    
+    IFC_MAPPING = {
+        # Structural Elements
+        "foundation": "IfcFooting",
+        "wall": "IfcWall",
+        "beam": "IfcBeam",
+        "column": "IfcColumn",
+        "slab": "IfcSlab",
+        "roof": "IfcRoof",
+        
+        # Building Services
+        "electrical": "IfcElectricalCircuit",
+        "plumbing": "IfcDistributionSystem",
+        "hvac": "IfcDistributionSystem",
+        "ventilation": "IfcDistributionSystem",
+        
+        # Space Elements
+        "room": "IfcSpace",
+        "floor": "IfcBuildingStorey",
+        "building": "IfcBuilding",
+        
+        # Materials
+        "concrete": "IfcMaterial",
+        "steel": "IfcMaterial",
+        "timber": "IfcMaterial",
+        "brick": "IfcMaterial",
+        
+        # Properties
+        "dimension": "IfcPropertySingleValue",
+        "material": "IfcMaterialProperties",
+        "thermal": "IfcThermalMaterialProperties",
+        "structural": "IfcStructuralMaterialProperties"
+    }
+    
+    # Common search terms and their related components
+    SEARCH_ALIASES = {
+        "structure": ["foundation", "wall", "beam", "column", "slab"],
+        "services": ["electrical", "plumbing", "hvac", "ventilation"],
+        "materials": ["concrete", "steel", "timber", "brick"],
+        "spaces": ["room", "floor", "building"],
+        "properties": ["dimension", "material", "thermal", "structural"]
+    }
+
+    # IFC_DATABASE lowercased once for search_ifc_database: (IFC code, lowercased code,
+    # name, type, list-valued property strings, and the whole entry as text) per entry
+    _IFC_DATABASE_LOWER = tuple(
+        (
+            ifc_code,
+            ifc_code.lower(),
+            data["name"].lower(),
+            data["type"].lower(),
+            tuple(
+                prop.lower()
+                for props in data.get("properties", {}).values() if isinstance(props, list)
+                for prop in props
+            ),
+            str(data).lower()
+        )
+        for ifc_code, data in IFC_DATABASE.items()
+    )
+    # search_ifc_database result per IFC code, built once; hits get a shallow copy
+    _IFC_RESULTS = {
+        ifc_code: {
+            "component": data["name"],
+            "type": data["type"],
+            "ifc_code": ifc_code,
+            "description": data["description"],
+            "dataset": "IFC Database",
+            "details": {
+                prop_type: [{"value": prop} for prop in props]
+                for prop_type, props in data.get("properties", {}).items() if isinstance(props, list)
+            }
+        }
+        for ifc_code, data in IFC_DATABASE.items()
+    }
+    _SEARCH_ALIASES_LOWER = tuple(
+        (alias_category.lower(), tuple(alias.lower() for alias in aliases))
+        for alias_category, aliases in SEARCH_ALIASES.items()
+    )
+
     def __init__(self):
         self.components = {}
         self.quantities = {}
@@ -18,136 +375,19 @@ class BuildingCodeAnalyzer:
         self.built_in_data = {}
         self.building_codes = {}  # Store building codes by location
         self.current_location = None
-        
+        self._token_vocabulary = {}  # Lowercased key token -> component keys, built by _process_data
+        self._component_order = {}
+        self._ifc_code_cache = {}  # Component key -> IFC code, filled by get_ifc_code
+        self._components_lower = ()  # (component key, lowercased key) pairs
+        self._guidelines_lower = {}  # Component key -> lowercased guideline description
+        self._code_requirements_cache = {}  # (location, category) -> (code data, requirements)
+        self._dataset_summary_cache = {}  # Dataset name -> (dataset data, summary)
+
         # Load built-in data files
         self.load_built_in_data()
         
         # Load building codes
         self.load_building_codes()
-        
-        self.ifc_database = {
-            # Structural Elements
-            "IfcFooting": {
-                "name": "Foundation",
-                "type": "Structural",
-                "description": "Building foundation element",
-                "properties": {
-                    "dimensions": ["depth", "width", "length"],
-                    "materials": ["concrete", "steel reinforcement"],
-                    "requirements": ["minimum depth", "bearing capacity"]
-                }
-            },
-            "IfcWall": {
-                "name": "Wall",
-                "type": "Structural",
-                "description": "Vertical building element",
-                "properties": {
-                    "dimensions": ["height", "thickness", "length"],
-                    "materials": ["brick", "concrete", "steel", "timber"],
-                    "requirements": ["fire rating", "thermal resistance"]
-                }
-            },
-            "IfcBeam": {
-                "name": "Beam",
-                "type": "Structural",
-                "description": "Horizontal structural element",
-                "properties": {
-                    "dimensions": ["span", "depth", "width"],
-                    "materials": ["steel", "concrete", "timber"],
-                    "requirements": ["load capacity", "deflection limits"]
-                }
-            },
-            "IfcColumn": {
-                "name": "Column",
-                "type": "Structural",
-                "description": "Vertical structural element",
-                "properties": {
-                    "dimensions": ["height", "width", "depth"],
-                    "materials": ["concrete", "steel", "timber"],
-                    "requirements": ["axial load capacity", "buckling resistance"]
-                }
-            },
-            # Building Services
-            "IfcElectricalCircuit": {
-                "name": "Electrical Circuit",
-                "type": "Services",
-                "description": "Electrical distribution system",
-                "properties": {
-                    "specifications": ["voltage", "current", "power"],
-                    "requirements": ["circuit protection", "wire size"]
-                }
-            },
-            "IfcDistributionSystem": {
-                "name": "Distribution System",
-                "type": "Services",
-                "description": "Building service distribution system",
-                "properties": {
-                    "specifications": ["flow rate", "pressure"],
-                    "requirements": ["insulation", "accessibility"]
-                }
-            },
-            # Space Elements
-            "IfcSpace": {
-                "name": "Room",
-                "type": "Space",
-                "description": "Occupiable space",
-                "properties": {
-                    "dimensions": ["area", "height"],
-                    "requirements": ["ventilation", "lighting"]
-                }
-            },
-            "IfcBuildingStorey": {
-                "name": "Floor",
-                "type": "Space",
-                "description": "Building floor level",
-                "properties": {
-                    "dimensions": ["height", "area"],
-                    "requirements": ["fire separation", "accessibility"]
-                }
-            }
-        }
-        
-        self.ifc_mapping = {
-            # Structural Elements
-            "foundation": "IfcFooting",
-            "wall": "IfcWall",
-            "beam": "IfcBeam",
-            "column": "IfcColumn",
-            "slab": "IfcSlab",
-            "roof": "IfcRoof",
-            
-            # Building Services
-            "electrical": "IfcElectricalCircuit",
-            "plumbing": "IfcDistributionSystem",
-            "hvac": "IfcDistributionSystem",
-            "ventilation": "IfcDistributionSystem",
-            
-            # Space Elements
-            "room": "IfcSpace",
-            "floor": "IfcBuildingStorey",
-            "building": "IfcBuilding",
-            
-            # Materials
-            "concrete": "IfcMaterial",
-            "steel": "IfcMaterial",
-            "timber": "IfcMaterial",
-            "brick": "IfcMaterial",
-            
-            # Properties
-            "dimension": "IfcPropertySingleValue",
-            "material": "IfcMaterialProperties",
-            "thermal": "IfcThermalMaterialProperties",
-            "structural": "IfcStructuralMaterialProperties"
-        }
-        
-        # Common search terms and their related components
-        self.search_aliases = {
-            "structure": ["foundation", "wall", "beam", "column", "slab"],
-            "services": ["electrical", "plumbing", "hvac", "ventilation"],
-            "materials": ["concrete", "steel", "timber", "brick"],
-            "spaces": ["room", "floor", "building"],
-            "properties": ["dimension", "material", "thermal", "structural"]
-        }
 
     def load_built_in_data(self):
         """Load all JSON files from the data directory."""
@@ -156,18 +396,13 @@ class BuildingCodeAnalyzer:
             if not os.path.exists(data_dir):
                 os.makedirs(data_dir)
                 
-            for filename in os.listdir(data_dir):
-                if filename.endswith('.json'):
-                    file_path = os.path.join(data_dir, filename)
-                    try:
-                        with open(file_path, 'r') as f:
-                            data = json.load(f)
-                            # Store the data with the filename as the key (without .json extension)
-                            key = os.path.splitext(filename)[0]
-                            self.built_in_data[key] = data
-                    except Exception as e:
-                        st.warning(f"Error loading built-in file {filename}: {str(e)}")
-                        continue
+            for filename, (data, error) in _load_json_directory(data_dir, _json_directory_signature(data_dir)):
+                if error is not None:
+                    st.warning(f"Error loading built-in file {filename}: {str(error)}")
+                    continue
+                # Store the data with the filename as the key (without .json extension)
+                key = os.path.splitext(filename)[0]
+                self.built_in_data[key] = data
         except Exception as e:
             st.warning(f"Error accessing data directory: {str(e)}")
 
@@ -178,125 +413,155 @@ class BuildingCodeAnalyzer:
             if not os.path.exists(codes_dir):
                 os.makedirs(codes_dir)
                 
-            for filename in os.listdir(codes_dir):
-                if filename.endswith('.json'):
-                    location = os.path.splitext(filename)[0].replace('_', ' ').title()
-                    file_path = os.path.join(codes_dir, filename)
-                    try:
-                        with open(file_path, 'r') as f:
-                            self.building_codes[location] = json.load(f)
-                    except Exception as e:
-                        st.warning(f"Error loading building code for {location}: {str(e)}")
-                        continue
+            for filename, (data, error) in _load_json_directory(codes_dir, _json_directory_signature(codes_dir)):
+                location = os.path.splitext(filename)[0].replace('_', ' ').title()
+                if error is not None:
+                    st.warning(f"Error loading building code for {location}: {str(error)}")
+                    continue
+                self.building_codes[location] = data
         except Exception as e:
             st.warning(f"Error accessing building codes directory: {str(e)}")
 
     def load_file(self, file_data) -> bool:
         """Load and process JSON data from uploaded file."""
         try:
-            data = json.loads(file_data)
-            
+            data = _json_loads(file_data)
+
             # Store the uploaded file data
             self.current_file = data
-            
-            # Clear existing data
-            self.components.clear()
-            self.quantities.clear()
-            self.guidelines.clear()
-            
-            def process_node(node, path="", context=""):
-                """Process each node in the JSON structure."""
-                if isinstance(node, dict):
-                    for key, value in node.items():
-                        current_path = f"{path}.{key}" if path else key
-                        current_context = f"{context} - {key}" if context else key
-                        
-                        # Create a component entry
-                        component_info = {
-                            "name": key,
-                            "type": self.detect_component_type(key),
-                            "path": current_path,
-                            "context": current_context,
-                            "details": {
-                                "dimensions": [],
-                                "materials": [],
-                                "requirements": [],
-                                "specifications": []
-                            }
-                        }
-                        
-                        # Process the value
-                        if isinstance(value, dict):
-                            # Extract direct properties
-                            for prop_key, prop_value in value.items():
-                                if prop_key in ["thickness", "height", "width", "depth", "area"]:
-                                    component_info["details"]["dimensions"].append({
-                                        "type": prop_key,
-                                        "value": prop_value,
-                                        "unit": "m" if prop_key in ["thickness", "height", "width", "depth"] else "m²"
-                                    })
-                                elif prop_key == "material":
-                                    component_info["details"]["materials"].append({
-                                        "name": prop_value,
-                                        "context": current_context
-                                    })
-                                elif prop_key == "description":
-                                    component_info["description"] = prop_value
-                                    # Extract requirements from description
-                                    if any(word in prop_value.lower() for word in ["must", "shall", "should", "require", "minimum", "maximum"]):
-                                        component_info["details"]["requirements"].append({
-                                            "requirement": prop_value,
-                                            "type": "mandatory" if any(word in prop_value.lower() for word in ["must", "shall", "require"]) else "recommended",
-                                            "context": current_context
-                                        })
-                            
-                            # Store the component
-                            self.components[current_path] = component_info
-                            
-                            # Recurse into nested structures
-                            process_node(value, current_path, current_context)
-                        elif isinstance(value, (int, float)):
-                            # Store as quantity
-                            self.quantities[current_path] = {
-                                "value": value,
-                                "unit": "units",
-                                "component": current_path,
-                                "context": current_context
-                            }
-                        elif isinstance(value, str):
-                            # Store as guideline
-                            self.guidelines[current_path] = {
-                                "description": value,
-                                "component": current_path,
-                                "context": current_context
-                            }
-                
-                elif isinstance(node, list):
-                    for i, item in enumerate(node):
-                        process_node(item, f"{path}[{i}]", context)
-            
-            # Process the data
-            process_node(data)
-            
-            return len(self.components) > 0
-            
+
+            return self._process_data(data)
+
         except Exception as e:
             st.error(f"Error loading file: {str(e)}")
             return False
 
+    def _process_data(self, data) -> bool:
+        """Organize JSON data into components, quantities, and guidelines."""
+        # Clear existing data
+        self.components.clear()
+        self.quantities.clear()
+        self.guidelines.clear()
+
+        components = self.components
+        quantities = self.quantities
+        guidelines = self.guidelines
+
+        # Walk the JSON depth-first with an explicit stack of child iterators,
+        # visiting keys in the same order as a recursive walk
+        stack = [_iter_children(data, "", "")]
+        while stack:
+            entry = next(stack[-1], None)
+            if entry is None:
+                stack.pop()
+                continue
+
+            key, value, current_path, current_context = entry
+            if key is None:
+                # List item: descend without creating a component
+                stack.append(_iter_children(value, current_path, current_context))
+                continue
+
+            if isinstance(value, dict):
+                # Create a component entry
+                component_info = {
+                    "name": key,
+                    "type": self.detect_component_type(key),
+                    "path": current_path,
+                    "context": current_context,
+                    "details": {
+                        "dimensions": [],
+                        "materials": [],
+                        "requirements": [],
+                        "specifications": []
+                    }
+                }
+
+                # Extract direct properties
+                for prop_key, prop_value in value.items():
+                    if prop_key in self._DIMENSION_PROPS:
+                        component_info["details"]["dimensions"].append({
+                            "type": prop_key,
+                            "value": prop_value,
+                            "unit": "m" if prop_key in self._LINEAR_PROPS else "m²"
+                        })
+                    elif prop_key == "material":
+                        component_info["details"]["materials"].append({
+                            "name": prop_value,
+                            "context": current_context
+                        })
+                    elif prop_key == "description":
+                        component_info["description"] = prop_value
+                        # Extract requirements from description
+                        description_lower = prop_value.lower()
+                        if self._REQUIREMENT_WORDS_RE.search(description_lower):
+                            component_info["details"]["requirements"].append({
+                                "requirement": prop_value,
+                                "type": "mandatory" if self._MANDATORY_WORDS_RE.search(description_lower) else "recommended",
+                                "context": current_context
+                            })
+
+                # Store the component, then descend into it
+                components[current_path] = component_info
+                stack.append(_iter_children(value, current_path, current_context))
+            elif isinstance(value, (int, float)):
+                # Store as quantity
+                quantities[current_path] = {
+                    "value": value,
+                    "unit": "units",
+                    "component": current_path,
+                    "context": current_context
+                }
+            elif isinstance(value, str):
+                # Store as guideline
+                guidelines[current_path] = {
+                    "description": value,
+                    "component": current_path,
+                    "context": current_context
+                }
+
+        # Collect the processed components' key tokens for search
+        self._build_token_vocabulary()
+
+        return len(self.components) > 0
+
+    def _build_token_vocabulary(self):
+        """Map the lowercased word tokens of component keys to the keys containing them."""
+        # Lowercase keys and guideline text once instead of on every query
+        self._components_lower = tuple((comp_key, comp_key.lower()) for comp_key in self.components)
+        self._guidelines_lower = {
+            comp_key: guideline["description"].lower() for comp_key, guideline in self.guidelines.items()
+        }
+
+        # Guidelines are string leaves and components are dict nodes, so no
+        # component has a guideline of its own and only keys are tokenized
+        token_vocabulary = defaultdict(set)
+        for comp_key, comp_key_lower in self._components_lower:
+            for token in _TOKEN_RE.findall(comp_key_lower):
+                token_vocabulary[token].add(comp_key)
+
+        self._token_vocabulary = token_vocabulary
+        self._component_order = {comp_key: i for i, comp_key in enumerate(self.components)}
+
+    def _match_term_part(self, part: str) -> set:
+        """Return the component keys that contain `part` as a substring."""
+        if _TOKEN_RE.fullmatch(part):
+            # A run of word characters can only occur inside a single token, so a
+            # substring scan over the distinct key tokens finds the same keys as
+            # one over every key, with far fewer strings to test
+            matches = set()
+            for token, comp_keys in self._token_vocabulary.items():
+                if part in token:
+                    matches.update(comp_keys)
+            return matches
+
+        # Parts spanning punctuation or whitespace are scanned against every key
+        return {comp_key for comp_key, comp_key_lower in self._components_lower if part in comp_key_lower}
+
     def detect_component_type(self, key: str) -> str:
         """Determine the type of a component based on its key."""
         try:
-            key_lower = key.lower()
-            if any(x in key_lower for x in ["wall", "beam", "column", "foundation", "roof", "floor", "ceiling"]):
-                return "Structural"
-            if any(x in key_lower for x in ["electrical", "plumbing", "hvac", "mechanical", "utility"]):
-                return "Utilities"
-            if any(x in key_lower for x in ["door", "window", "stairs", "elevator"]):
-                return "Architectural"
-            if any(x in key_lower for x in ["fire", "safety", "emergency", "exit"]):
-                return "Safety"
-            return "General"
+            return _classify_component(key)
         except Exception as e:
             st.warning(f"Error detecting component type for '{key}': {str(e)}")
             return "General"
@@ -311,66 +576,75 @@ class BuildingCodeAnalyzer:
             "specifications": []
         }
         
-        # Extract numerical specifications with units
-        numerical_specs = re.findall(
-            r"(\d+(?:\.\d+)?)\s*(mm|cm|m|ft|in|%|degrees?|MPa|PSI|kN|kPa|m²|m³|ft²|ft³|kW|A)", 
-            guideline_text
-        )
-        
-        # Common material keywords
-        material_keywords = ["concrete", "steel", "timber", "wood", "brick", "metal", "aluminum", 
-                           "copper", "PVC", "glass", "plasterboard", "insulation"]
-        
-        # Placement keywords
-        placement_keywords = ["located", "installed", "mounted", "positioned", "placed", "between",
-                            "above", "below", "near", "adjacent", "inside", "outside", "centers"]
-        
-        # Requirement keywords
-        requirement_keywords = ["required", "minimum", "maximum", "must", "shall", "should",
-                             "need", "necessary", "mandatory", "essential"]
-        
-        # Process the text line by line for better organization
-        lines = guideline_text.lower().split('.')
-        for line in lines:
-            line = line.strip()
-            if not line:
+        # Spans of the sentences between '.' separators
+        sentence_spans = [m.span() for m in _SENTENCE_RE.finditer(guideline_text)]
+        sentence_starts = [start for start, _ in sentence_spans]
+        seen = set()
+
+        # One pass finds numbers with units and material, placement and requirement keywords
+        for match in _DETAIL_RE.finditer(guideline_text):
+            group = match.lastgroup
+            if group == "unit":
+                unit = match.group("unit")
+                spec = {"value": float(match.group("num")), "unit": unit}
+                if "dimension" in unit or unit in self._LENGTH_UNITS:
+                    details["dimensions"].append(spec)
+                else:
+                    details["specifications"].append(spec)
                 continue
-                
-            # Check for materials
-            for material in material_keywords:
-                if material in line:
-                    details["materials"].append(line)
-                    break
-                    
-            # Check for placement information
-            for keyword in placement_keywords:
-                if keyword in line:
-                    details["placement"].append(line)
-                    break
-                    
-            # Check for requirements
-            for keyword in requirement_keywords:
-                if keyword in line:
-                    details["requirements"].append(line)
-                    break
-        
-        # Process numerical specifications
-        for value, unit in numerical_specs:
-            spec = {"value": float(value), "unit": unit}
-            if "dimension" in unit or unit in ["mm", "cm", "m", "ft", "in"]:
-                details["dimensions"].append(spec)
-            else:
-                details["specifications"].append(spec)
+
+            # Each sentence is recorded at most once per category
+            index = bisect_right(sentence_starts, match.start()) - 1
+            if (group, index) in seen:
+                continue
+            seen.add((group, index))
+            sentence_start, sentence_end = sentence_spans[index]
+            details[_DETAIL_GROUPS[group]].append(
+                guideline_text[sentence_start:sentence_end].lower().strip()
+            )
         
         return details
 
     def get_ifc_code(self, component_key: str) -> str:
         """Get the corresponding IFC code for a component."""
+        ifc_code = self._ifc_code_cache.get(component_key)
+        if ifc_code is not None:
+            return ifc_code
+
+        ifc_code = "IfcBuildingElement"  # Default fallback
         key_lower = component_key.lower()
-        for term, ifc_code in self.ifc_mapping.items():
+        for term, mapped_code in self.IFC_MAPPING.items():
             if term in key_lower:
-                return ifc_code
-        return "IfcBuildingElement"  # Default fallback
+                ifc_code = mapped_code
+                break
+
+        self._ifc_code_cache[component_key] = ifc_code
+        return ifc_code
+
+    def _build_result(self, comp_key: str) -> Dict:
+        """Build the search result entry for a single component."""
+        result = {
+            "component": comp_key,
+            "type": self.detect_component_type(comp_key),
+            "ifc_code": self.get_ifc_code(comp_key),
+            "details": {}
+        }
+
+        # Add direct quantities if available
+        if comp_key in self.quantities:
+            q = self.quantities[comp_key]
+            result["quantity"] = {
+                "value": q["value"],
+                "unit": q["unit"]
+            }
+
+        # Extract structured information from guidelines
+        if comp_key in self.guidelines:
+            result["details"] = self.extract_component_details(
+                self.guidelines[comp_key]["description"]
+            )
+
+        return result
 
     def _base_search(self, term: str) -> List[Dict]:
         """Base search implementation that works on the current analyzer's data."""
@@ -379,45 +653,16 @@ class BuildingCodeAnalyzer:
 
         results = []
         term_parts = term.lower().split('.')
-        
-        for comp_key, comp_data in self.components.items():
-            comp_key_lower = comp_key.lower()
-            should_include = False
-            
-            # Check if component matches search term
-            if term.lower() == comp_key_lower:
-                should_include = True
-            elif all(part in comp_key_lower for part in term_parts):
-                should_include = True
-            elif any(part in comp_key_lower for part in term_parts):
-                should_include = True
-            elif comp_key in self.guidelines and any(part in str(self.guidelines[comp_key]).lower() for part in term_parts):
-                should_include = True
-            
-            if should_include:
-                result = {
-                    "component": comp_key,
-                    "type": self.detect_component_type(comp_key),
-                    "ifc_code": self.get_ifc_code(comp_key),
-                    "details": {}
-                }
-                
-                # Add direct quantities if available
-                if comp_key in self.quantities:
-                    q = self.quantities[comp_key]
-                    result["quantity"] = {
-                        "value": q["value"],
-                        "unit": q["unit"]
-                    }
-                
-                # Extract structured information from guidelines
-                if comp_key in self.guidelines:
-                    result["details"] = self.extract_component_details(
-                        self.guidelines[comp_key]["description"]
-                    )
-                
-                results.append(result)
-        
+
+        # A component matches when any part of the term occurs in its key or
+        # guideline (exact and all-parts matches are subsets of this)
+        matched = set()
+        for part in term_parts:
+            matched |= self._match_term_part(part)
+
+        for comp_key in sorted(matched, key=self._component_order.__getitem__):
+            results.append(self._build_result(comp_key))
+
         return results
 
     def search(self, term: str) -> List[Dict]:
@@ -430,129 +675,105 @@ class BuildingCodeAnalyzer:
             # Clean and process the natural language query
             query = term.lower()
             
-            # Extract key information from natural language query
-            dimension_terms = ["width", "height", "depth", "length", "diameter", "size", "thickness", "area"]
-            material_terms = ["made of", "material", "built with", "constructed with", "composition"]
-            requirement_terms = ["requirement", "required", "must be", "should be", "minimum", "maximum", "at least", "no more than"]
-            placement_terms = ["located", "installed", "mounted", "positioned", "placed", "between", "above", "below", "adjacent"]
-            
             # Remove common question phrases
-            query = re.sub(r'\b(i want to know|tell me|what is|show me|the)\b', '', query).strip()
-            
-            # Extract search focus
-            search_focus = {
-                "dimension": any(term in query for term in dimension_terms),
-                "material": any(term in query for term in material_terms),
-                "requirement": any(term in query for term in requirement_terms),
-                "placement": any(term in query for term in placement_terms)
-            }
+            query = _QUESTION_PHRASE_RE.sub('', query).strip()
             
             # Extract component name (last word or words after "of")
             component_name = query.split("of ")[-1].strip() if "of" in query else query.split()[-1]
             
-            # Search through components
-            for comp_key, comp_data in self.components.items():
+            # Only components whose key contains the name, found by scanning the
+            # key token vocabulary, in component order
+            matched = self._match_term_part(component_name)
+            for comp_key in sorted(matched, key=self._component_order.__getitem__):
+                comp_data = self.components[comp_key]
                 try:
-                    should_include = False
-                    comp_key_lower = comp_key.lower()
+                    result = {
+                        "component": comp_key,
+                        "type": comp_data.get("type", "Unknown"),
+                        "details": {
+                            "dimensions": [],
+                            "materials": [],
+                            "requirements": [],
+                            "placement": [],
+                            "specifications": []
+                        }
+                    }
                     
-                    # Check if component matches
-                    if component_name in comp_key_lower:
-                        should_include = True
+                    # Add context and path information
+                    if "context" in comp_data:
+                        result["context"] = comp_data["context"]
+                    if "path" in comp_data:
+                        result["path"] = comp_data["path"]
                     
-                    # Check guidelines and specifications
-                    if comp_key in self.guidelines:
-                        guideline = self.guidelines[comp_key]
-                        if component_name in str(guideline).lower():
-                            should_include = True
+                    # Add description if available
+                    if "description" in comp_data:
+                        result["description"] = comp_data["description"]
                     
-                    if should_include:
-                        result = {
-                            "component": comp_key,
-                            "type": comp_data.get("type", "Unknown"),
-                            "details": {
-                                "dimensions": [],
-                                "materials": [],
-                                "requirements": [],
-                                "placement": [],
-                                "specifications": []
+                    # Extract numerical values with units
+                    if comp_key in self.guidelines:
+                        guideline_text = self.guidelines[comp_key]["description"]
+                        for value, unit in _parse_numeric_specs(guideline_text):
+                            spec = {
+                                "value": value,
+                                "unit": unit,
+                                "context": comp_data.get("context", "")
                             }
-                        }
-                        
-                        # Add context and path information
-                        if "context" in comp_data:
-                            result["context"] = comp_data["context"]
-                        if "path" in comp_data:
-                            result["path"] = comp_data["path"]
-                        
-                        # Add description if available
-                        if "description" in comp_data:
-                            result["description"] = comp_data["description"]
-                        
-                        # Extract numerical values with units
-                        if comp_key in self.guidelines:
-                            guideline_text = str(self.guidelines[comp_key])
-                            numerical_specs = re.findall(
-                                r"(\d+(?:\.\d+)?)\s*(mm|cm|m|ft|in|%|degrees?|MPa|PSI|kN|kPa|m²|m³|ft²|ft³|kW|A)",
-                                guideline_text
-                            )
                             
-                            for value, unit in numerical_specs:
-                                spec = {
-                                    "value": float(value),
-                                    "unit": unit,
-                                    "context": comp_data.get("context", "")
-                                }
-                                
-                                # Categorize the specification
-                                if unit in ["mm", "cm", "m", "ft", "in"]:
-                                    result["details"]["dimensions"].append(spec)
-                                elif unit in ["MPa", "PSI", "kN", "kPa"]:
-                                    result["details"]["specifications"].append(spec)
-                        
-                        # Add dimensions from component data
-                        if "dimensions" in comp_data:
-                            result["details"]["dimensions"].extend(comp_data["dimensions"])
-                        
-                        # Add materials with context
-                        if "materials" in comp_data:
-                            result["details"]["materials"].extend(comp_data["materials"])
-                        
-                        # Add placement information
-                        if "placement" in comp_data:
-                            result["details"]["placement"].extend(comp_data["placement"])
-                        elif comp_key in self.guidelines:
-                            # Extract placement information from guidelines
-                            guideline_text = str(self.guidelines[comp_key])
-                            for term in placement_terms:
-                                if term in guideline_text.lower():
-                                    sentences = re.split(r'[.!?]+', guideline_text)
-                                    for sentence in sentences:
-                                        if term in sentence.lower():
-                                            result["details"]["placement"].append(sentence.strip())
-                        
-                        # Add requirements with context
-                        if "requirements" in comp_data:
-                            result["details"]["requirements"].extend(comp_data["requirements"])
-                        elif comp_key in self.guidelines:
-                            # Extract requirements from guidelines
-                            guideline_text = str(self.guidelines[comp_key])
-                            for term in requirement_terms:
-                                if term in guideline_text.lower():
-                                    sentences = re.split(r'[.!?]+', guideline_text)
-                                    for sentence in sentences:
-                                        result["details"]["requirements"].append({
-                                            "requirement": sentence.strip(),
-                                            "type": "mandatory" if term in ["must", "required", "shall"] else "recommended",
-                                            "context": comp_data.get("context", "")
-                                        })
-                        
-                        # Add quantity information if available
-                        if comp_key in self.quantities:
-                            result["quantity"] = self.quantities[comp_key]
-                        
-                        results.append(result)
-                        
+                            # Categorize the specification
+                            if unit in self._LENGTH_UNITS:
+                                result["details"]["dimensions"].append(spec)
+                            elif unit in self._STRENGTH_UNITS:
+                                result["details"]["specifications"].append(spec)
+                    
+                    # Add dimensions from component data
+                    if "dimensions" in comp_data:
+                        result["details"]["dimensions"].extend(comp_data["dimensions"])
+                    
+                    # Add materials with context
+                    if "materials" in comp_data:
+                        result["details"]["materials"].extend(comp_data["materials"])
+                    
+                    # Add placement information
+                    if "placement" in comp_data:
+                        result["details"]["placement"].extend(comp_data["placement"])
+                    elif comp_key in self.guidelines:
+                        # Extract placement information from guidelines
+                        guideline_lower = self._guidelines_lower[comp_key]
+                        terms = [term for term in self._PLACEMENT_TERMS if term in guideline_lower]
+                        if terms:
+                            sentences = _SENTENCE_SPLIT_RE.split(self.guidelines[comp_key]["description"])
+                            sentences_lower = [sentence.lower() for sentence in sentences]
+                            for term in terms:
+                                for sentence, sentence_lower in zip(sentences, sentences_lower):
+                                    if term in sentence_lower:
+                                        result["details"]["placement"].append(sentence.strip())
+                    
+                    # Add requirements with context
+                    if "requirements" in comp_data:
+                        result["details"]["requirements"].extend(comp_data["requirements"])
+                    elif comp_key in self.guidelines:
+                        # Extract requirements from guidelines
+                        guideline_lower = self._guidelines_lower[comp_key]
+                        terms = [term for term in self._REQUIREMENT_TERMS if term in guideline_lower]
+                        if terms:
+                            sentences = [
+                                sentence.strip()
+                                for sentence in _SENTENCE_SPLIT_RE.split(self.guidelines[comp_key]["description"])
+                            ]
+                            for term in terms:
+                                for sentence in sentences:
+                                    result["details"]["requirements"].append({
+                                        "requirement": sentence,
+                                        "type": "mandatory" if term in self._MANDATORY_TERMS else "recommended",
+                                        "context": comp_data.get("context", "")
+                                    })
+                    
+                    # Add quantity information if available
+                    if comp_key in self.quantities:
+                        result["quantity"] = self.quantities[comp_key]
+                    
+                    results.append(result)
+                    
                 except Exception as e:
                     st.warning(f"Error processing component {comp_key}: {str(e)}")
                     continue
@@ -582,28 +803,44 @@ class BuildingCodeAnalyzer:
             return
             
         st.subheader("Available Built-in Datasets")
-        for dataset_name, data in self.built_in_data.items():
+        for dataset_name in self.built_in_data:
             with st.expander(f"Dataset: {dataset_name}"):
                 try:
-                    # Create a temporary analyzer to process this dataset
-                    temp_analyzer = BuildingCodeAnalyzer()
-                    temp_analyzer._process_data(data)
+                    components, guidelines, quantities, sample_components = self._dataset_summary(dataset_name)
                     
                     # Display statistics
-                    st.metric("Components", len(temp_analyzer.components))
-                    st.metric("Guidelines", len(temp_analyzer.guidelines))
-                    st.metric("Quantities", len(temp_analyzer.quantities))
+                    st.metric("Components", components)
+                    st.metric("Guidelines", guidelines)
+                    st.metric("Quantities", quantities)
                     
                     # Display sample components
-                    if temp_analyzer.components:
+                    if sample_components:
                         st.write("Sample components:")
-                        sample_components = list(temp_analyzer.components.keys())[:5]
                         for comp in sample_components:
                             st.write(f"- {comp}")
                 except Exception as e:
                     st.error(f"Error processing dataset {dataset_name}: {str(e)}")
                     continue
 
+    def _dataset_summary(self, dataset_name: str) -> Tuple[int, int, int, List[str]]:
+        """Count a built-in dataset's components, guidelines and quantities once per loaded dataset."""
+        data = self.built_in_data[dataset_name]
+        cached = self._dataset_summary_cache.get(dataset_name)
+        if cached is not None and cached[0] is data:
+            return cached[1]
+
+        # Create a temporary analyzer to process this dataset
+        temp_analyzer = BuildingCodeAnalyzer()
+        temp_analyzer._process_data(data)
+        summary = (
+            len(temp_analyzer.components),
+            len(temp_analyzer.guidelines),
+            len(temp_analyzer.quantities),
+            list(islice(temp_analyzer.components, 5))
+        )
+        self._dataset_summary_cache[dataset_name] = (data, summary)
+        return summary
+
     def display_building_code_info(self):
         """Display information about available building codes."""
         if not self.building_codes:
@@ -622,192 +859,157 @@ class BuildingCodeAnalyzer:
                     
                     # Display sample requirements
                     st.write("\n**Sample Requirements:**")
-                    def get_sample_requirements(d, max_samples=3, current=0):
-                        samples = []
-                        if not isinstance(d, dict) or current >= max_samples:
-                            return samples
-                        
-                        for k, v in d.items():
-                            if isinstance(v, dict):
-                                if "requirement" in str(v).lower() or "minimum" in str(v).lower():
-                                    samples.append(f"- {k}: {str(v)}")
-                                if len(samples) >= max_samples:
-                                    break
-                                samples.extend(get_sample_requirements(v, max_samples, len(samples)))
-                        return samples[:max_samples]
-                    
-                    samples = get_sample_requirements(code_data)
-                    for sample in samples:
+                    for sample in islice(_iter_sample_requirements(code_data), 3):
                         st.write(sample)
                         
                 except Exception as e:
                     st.error(f"Error processing building code for {location}: {str(e)}")
                     continue
 
+    def _fuzzy_component_category(self, query: str) -> Optional[str]:
+        """Resolve a component category from near-miss query words."""
+        for token in _TOKEN_RE.findall(query):
+            if len(token) < 5:
+                continue
+            # Damerau-Levenshtein counts a swap of adjacent letters ("widnow") as
+            # one edit; 0.8 allows one edit in five letters
+            match = process.extractOne(
+                token, self._FUZZY_TERMS, scorer=_typo_similarity, score_cutoff=0.8
+            )
+            if match:
+                return self._FUZZY_TERM_CATEGORIES[match[2]]
+        return None
+
     def search_building_codes(self, query: str, location: Optional[str] = None) -> List[Dict]:
         """Search building codes with improved component search."""
         results = []
         query = query.lower()
         
-        # Define component categories and their related terms
-        component_categories = {
-            "wall": {
-                "terms": ["wall", "partition", "barrier", "enclosure"],
-                "types": ["exterior", "interior", "fire", "load-bearing", "non-load-bearing", "shear"],
-                "properties": ["height", "thickness", "width", "fire-rating", "insulation", "structural"]
-            },
-            "door": {
-                "terms": ["door", "doorway", "entrance", "exit"],
-                "types": ["exterior", "interior", "fire", "emergency", "sliding", "revolving"],
-                "properties": ["width", "height", "clearance", "fire-rating", "accessibility"]
-            },
-            "window": {
-                "terms": ["window", "glazing", "opening"],
-                "types": ["exterior", "interior", "emergency", "fixed", "operable"],
-                "properties": ["width", "height", "sill-height", "glazing-area", "ventilation"]
-            },
-            "foundation": {
-                "terms": ["foundation", "footing", "base", "substructure"],
-                "types": ["strip", "pad", "raft", "pile", "shallow", "deep"],
-                "properties": ["depth", "width", "bearing-capacity", "reinforcement"]
-            }
-        }
-        
-        # Find matching component category
-        target_category = None
-        target_terms = []
-        for category, info in component_categories.items():
-            if any(term in query for term in info["terms"]):
-                target_category = category
-                target_terms = info["terms"]
-                break
-        
+        # Find matching component category, trying an exact term first
+        target_category = self._COMPONENT_TERM_INDEX.get(query.strip())
+        if not target_category:
+            for category, terms_re in self._COMPONENT_CATEGORY_RES.items():
+                if terms_re.search(query):
+                    target_category = category
+                    break
+
+        # Fall back to fuzzy matching so misspelled components still resolve
+        if not target_category:
+            target_category = self._fuzzy_component_category(query)
+
         if not target_category:
             return results
         
-        def extract_requirements(data: Dict, path: str = "", context: str = "") -> List[Dict]:
-            """Extract requirements from nested dictionary structure."""
-            requirements = []
-            
-            if isinstance(data, dict):
-                for key, value in data.items():
-                    current_path = f"{path}.{key}" if path else key
-                    current_context = f"{context} - {key}" if context else key
-                    
-                    # Check if this node contains relevant information
-                    key_lower = key.lower()
-                    if any(term in key_lower for term in target_terms):
-                        if isinstance(value, str):
-                            # Extract numerical values with units
-                            numerical = re.findall(
-                                r"(\d+(?:\.\d+)?)\s*(mm|cm|m|ft|in|%|degrees?|MPa|PSI|kN|kPa|m²|m³|ft²|ft³|kW|A)",
-                                value.lower()
-                            )
-                            
-                            requirement = {
-                                "component": key,
-                                "type": "requirement",
-                                "path": current_path,
-                                "context": current_context,
-                                "value": value,
-                                "numerical_values": [{"value": float(num), "unit": unit} for num, unit in numerical],
-                                "category": "Unknown"
-                            }
-                            
-                            # Categorize requirement
-                            if any(word in value.lower() for word in ["height", "width", "thickness", "dimension"]):
-                                requirement["category"] = "Dimensional"
-                            elif any(word in value.lower() for word in ["fire", "safety", "emergency", "protection"]):
-                                requirement["category"] = "Safety"
-                            elif any(word in value.lower() for word in ["material", "concrete", "steel", "wood"]):
-                                requirement["category"] = "Material"
-                            elif any(word in value.lower() for word in ["install", "construct", "build", "place"]):
-                                requirement["category"] = "Construction"
-                            elif any(word in value.lower() for word in ["load", "strength", "capacity", "structural"]):
-                                requirement["category"] = "Structural"
-                            
-                            requirements.append(requirement)
-                        
-                        elif isinstance(value, dict):
-                            # If it's a dictionary, it might contain nested requirements
-                            requirements.extend(extract_requirements(value, current_path, current_context))
-                    
-                    # Continue searching in nested structures
-                    elif isinstance(value, (dict, list)):
-                        requirements.extend(extract_requirements(value, current_path, current_context))
-            
-            elif isinstance(data, list):
-                for i, item in enumerate(data):
-                    if isinstance(item, (dict, list)):
-                        requirements.extend(extract_requirements(item, f"{path}[{i}]", context))
-            
-            return requirements
-        
         # Search through each location's building codes
         if location:
             if location in self.building_codes:
-                results.extend(extract_requirements(self.building_codes[location]))
+                results.extend(
+                    dict(requirement) for requirement in self._code_requirements(location, target_category)
+                )
         else:
-            for loc, code_data in self.building_codes.items():
-                location_results = extract_requirements(code_data)
-                for result in location_results:
+            for loc in self.building_codes:
+                for requirement in self._code_requirements(loc, target_category):
+                    result = dict(requirement)
                     result["location"] = loc
-                results.extend(location_results)
+                    results.append(result)
         
         return results
 
+    def _code_requirements(self, location: str, category: str) -> List[Dict]:
+        """Extract a location's requirements for a component category, walking each code once per category."""
+        code_data = self.building_codes[location]
+        cached = self._code_requirements_cache.get((location, category))
+        if cached is not None and cached[0] is code_data:
+            return cached[1]
+
+        target_re = self._COMPONENT_CATEGORY_RES[category]
+        requirements = []
+
+        # Depth-first walk in document order with an explicit stack
+        stack = [_iter_children(code_data, "", "")]
+        while stack:
+            entry = next(stack[-1], None)
+            if entry is None:
+                stack.pop()
+                continue
+
+            key, value, current_path, current_context = entry
+            if key is None:
+                # List item
+                if isinstance(value, (dict, list)):
+                    stack.append(_iter_children(value, current_path, current_context))
+                continue
+
+            # Check if this node contains relevant information
+            key_lower = key.lower()
+            if target_re.search(key_lower):
+                if isinstance(value, str):
+                    value_lower = value.lower()
+                    requirement = {
+                        "component": key,
+                        "type": "requirement",
+                        "path": current_path,
+                        "context": current_context,
+                        "value": value,
+                        "numerical_values": [
+                            {"value": num, "unit": unit} for num, unit in _parse_numeric_specs(value_lower)
+                        ],
+                        "category": "Unknown"
+                    }
+
+                    # Categorize requirement
+                    for requirement_category, words_re in self._REQUIREMENT_CATEGORIES:
+                        if words_re.search(value_lower):
+                            requirement["category"] = requirement_category
+                            break
+
+                    requirements.append(requirement)
+
+                elif isinstance(value, dict):
+                    # If it's a dictionary, it might contain nested requirements
+                    stack.append(_iter_children(value, current_path, current_context))
+
+            # Continue searching in nested structures
+            elif isinstance(value, (dict, list)):
+                stack.append(_iter_children(value, current_path, current_context))
+
+        self._code_requirements_cache[(location, category)] = (code_data, requirements)
+        return requirements
+
     def search_ifc_database(self, term: str) -> List[Dict]:
         """Search the IFC database for components matching the search term."""
         results = []
         term = term.lower()
         
         # Check direct IFC code matches
-        for ifc_code, data in self.ifc_database.items():
+        for ifc_code, code_lower, name_lower, type_lower, props_lower, data_lower in self._IFC_DATABASE_LOWER:
             should_include = False
             
             # Check if the term matches the IFC code or name
-            if term in ifc_code.lower() or term in data["name"].lower():
+            if term in code_lower or term in name_lower:
                 should_include = True
             
             # Check if the term matches the type
-            elif term in data["type"].lower():
+            elif term in type_lower:
                 should_include = True
             
             # Check if the term matches any properties
-            elif "properties" in data:
-                for prop_type, props in data["properties"].items():
-                    if isinstance(props, list) and any(term in prop.lower() for prop in props):
-                        should_include = True
-                        break
+            elif any(term in prop for prop in props_lower):
+                should_include = True
             
             # Check aliases
-            for alias_category, aliases in self.search_aliases.items():
-                if term in alias_category.lower():
-                    if data["type"].lower() in [a.lower() for a in aliases]:
+            for alias_category, aliases in self._SEARCH_ALIASES_LOWER:
+                if term in alias_category:
+                    if type_lower in aliases:
                         should_include = True
                         break
-                elif any(term in alias.lower() for alias in aliases):
-                    if any(alias.lower() in str(data).lower() for alias in aliases):
+                elif any(term in alias for alias in aliases):
+                    if any(alias in data_lower for alias in aliases):
                         should_include = True
                         break
             
             if should_include:
-                result = {
-                    "component": data["name"],
-                    "type": data["type"],
-                    "ifc_code": ifc_code,
-                    "description": data["description"],
-                    "dataset": "IFC Database",
-                    "details": {}
-                }
-                
-                # Add properties as details
-                if "properties" in data:
-                    for prop_type, props in data["properties"].items():
-                        if isinstance(props, list):
-                            result["details"][prop_type] = [{"value": prop} for prop in props]
-                
-                results.append(result)
+                results.append(dict(self._IFC_RESULTS[ifc_code]))
         
         return results
 
@@ -972,8 +1174,8 @@ def main():
                     try:
                         with st.spinner('Processing data...'):
                             st.session_state.uploaded_file = uploaded_file
-                            file_contents = uploaded_file.read().decode("utf-8")
-                            if st.session_state.analyzer.load_file(file_contents):
+                            # getbuffer() views the upload in place instead of copying it out
+                            if st.session_state.analyzer.load_file(uploaded_file.getbuffer()):
                                 st.success("File loaded successfully!")
                                 
                                 # Display component statistics safely
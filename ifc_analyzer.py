@@ -3,30 +3,42 @@ import json
 import re
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Tuple, Any, Set
+from typing import Dict, FrozenSet, List, Optional, Tuple, Any, Set
 import ifcopenshell
-import plotly.graph_objects as go
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.stem import WordNetLemmatizer
-from nltk.corpus import stopwords
-from nltk.chunk import ne_chunk
-from nltk.tag import pos_tag
+import ifcopenshell.ifcopenshell_wrapper
+from scipy.sparse import csr_matrix
 import spacy
+from spacy.lang.en.stop_words import STOP_WORDS
 import os
+import sys
+import tempfile
+import hashlib
+import heapq
+from functools import lru_cache
+from itertools import repeat
+from types import MappingProxyType
 
-# Download required NLTK data with error handling
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# NLTK and scikit-learn are imported on first use rather than at startup: together
+# they account for several seconds of the app's cold start, and neither is needed
+# until stopwords are read or a search runs
+
+# Download required NLTK data with error handling; Streamlit re-executes this
+# script on every rerun, so the probes are cached for the life of the process
+@st.cache_resource(show_spinner=False)
 def download_nltk_data():
+    import nltk
     try:
-        nltk.data.find('tokenizers/punkt')
         nltk.data.find('corpora/stopwords')
         nltk.data.find('taggers/averaged_perceptron_tagger')
         nltk.data.find('corpora/wordnet')
     except LookupError:
         try:
-            nltk.download('punkt', quiet=True)
             nltk.download('stopwords', quiet=True)
             nltk.download('averaged_perceptron_tagger', quiet=True)
             nltk.download('wordnet', quiet=True)
@@ -35,646 +47,837 @@ def download_nltk_data():
         except Exception as e:
             st.error(f"Error downloading NLTK data: {str(e)}")
 
-# Download NLTK data at startup
-download_nltk_data()
+@st.cache_resource(show_spinner=False)
+def english_stopwords() -> frozenset:
+    """Load the NLTK English stopword list once per process."""
+    download_nltk_data()
+    from nltk.corpus import stopwords
+    try:
+        return frozenset(stopwords.words('english'))
+    except LookupError:
+        # Corpus unavailable (e.g. the download failed offline); caching spaCy's
+        # list keeps every later call from retrying the load and raising again
+        return frozenset(STOP_WORDS)
 
-class IFCAnalyzer:
-    def __init__(self):
-        self.lemmatizer = WordNetLemmatizer()
-        self.stop_words = set(stopwords.words('english'))
-        self.nlp = spacy.load('en_core_web_sm')
-        
-        # Enhanced component types with variations
-        self.component_types = {
-            "wall": ["wall", "partition", "barrier"],
-            "door": ["door", "entrance", "exit", "gateway"],
-            "window": ["window", "opening", "glazing"],
-            "slab": ["slab", "floor", "ceiling", "deck"],
-            "beam": ["beam", "girder", "joist"],
-            "column": ["column", "pillar", "post"],
-            "stair": ["stair", "stairway", "staircase", "steps"],
-            "roof": ["roof", "roofing", "covering"],
-            "space": ["space", "room", "area", "zone"],
-            "pipe": ["pipe", "conduit", "duct"],
-            "fixture": ["fixture", "fitting", "equipment"]
+@st.cache_resource(show_spinner=False)
+def wordnet_lemmatizer():
+    """Create the NLTK WordNet lemmatizer once per process."""
+    download_nltk_data()
+    from nltk.stem import WordNetLemmatizer
+    return WordNetLemmatizer()
+
+@st.cache_resource(show_spinner=False)
+def load_spacy_model(name: str = 'en_core_web_sm'):
+    """Load a spaCy pipeline once per process; every session's analyzer shares it."""
+    # Queries read tokens, lemmas and entities but never the dependency parse,
+    # so the parser is left out of every query's pipeline run
+    return spacy.load(name, exclude=["parser"])
+
+_CAMEL_CASE_RE = re.compile(r"(?<=[a-z])(?=[A-Z])")
+
+@lru_cache(maxsize=None)
+def _declared_entity_types(schema_name: str) -> Tuple[str, ...]:
+    """IFC_SCHEMA's entity types that an IFC schema version such as "IFC2X3" or "IFC4" defines."""
+    schema = ifcopenshell.ifcopenshell_wrapper.schema_by_name(schema_name)
+    declared = []
+    for entity_type in IFC_SCHEMA:
+        try:
+            schema.declaration_by_name(entity_type)
+        except RuntimeError:
+            continue
+        declared.append(entity_type)
+    return tuple(declared)
+
+@lru_cache(maxsize=None)
+def _entity_attribute_names(schema_name: str, entity_type: str) -> FrozenSet[str]:
+    """Direct and inverse attribute names an IFC schema version declares for an entity type and its subtypes."""
+    declaration = ifcopenshell.ifcopenshell_wrapper.schema_by_name(schema_name).declaration_by_name(entity_type)
+    return frozenset(
+        attribute.name()
+        for attribute in (*declaration.all_attributes(), *declaration.all_inverse_attributes())
+    )
+
+# Cached: the same type and property names recur across most entities of a file
+@lru_cache(maxsize=65536)
+def _split_camel_case(text: str) -> str:
+    """Split IFC-style identifiers such as "IfcWall" or "FireRating" into words."""
+    return _CAMEL_CASE_RE.sub(" ", text)
+
+# Cached for the same reason; this runs for every property of every entity
+@lru_cache(maxsize=65536)
+def _is_dimension_property(prop_name: str) -> bool:
+    """Whether a property name such as "NominalHeight" names a dimension."""
+    name = prop_name.lower()
+    return any(term in name for term in ATTRIBUTE_KEYWORDS["dimension"]["terms"])
+
+# Static page content, built once per process instead of on every Streamlit rerun
+COMPONENT_OPTIONS = {
+    "Structural Components": ["Beam", "Column", "Slab", "Wall (Structural)", "Foundation"],
+    "Architectural Elements": ["Wall (Partition)", "Door", "Window", "Stairs", "Railing"],
+    "MEP Systems": ["HVAC", "Plumbing", "Electrical", "Fire Protection"],
+    "Fire Safety": ["Fire Walls", "Fire Doors", "Sprinkler Systems", "Emergency Lighting"],
+    "Accessibility Features": ["Ramps", "Accessible Routes", "Restrooms", "Signage"]
+}
+
+MATERIAL_PROPERTIES = pd.DataFrame({
+    "Property": ["Compressive Strength", "Tensile Strength", "Fire Rating"],
+    "Requirement": ["As specified", "Per design", "2 hours minimum"],
+    "Test Method": ["ASTM C39", "ASTM A370", "UL 263"]
+})
+
+# Reference tables below are shared read-only by every IFCAnalyzer instead of
+# being rebuilt per instance
+
+# Enhanced component types with variations
+COMPONENT_TYPES = MappingProxyType({
+    "wall": ["wall", "partition", "barrier"],
+    "door": ["door", "entrance", "exit", "gateway"],
+    "window": ["window", "opening", "glazing"],
+    "slab": ["slab", "floor", "ceiling", "deck"],
+    "beam": ["beam", "girder", "joist"],
+    "column": ["column", "pillar", "post"],
+    "stair": ["stair", "stairway", "staircase", "steps"],
+    "roof": ["roof", "roofing", "covering"],
+    "space": ["space", "room", "area", "zone"],
+    "pipe": ["pipe", "conduit", "duct"],
+    "fixture": ["fixture", "fitting", "equipment"]
+})
+
+# Enhanced attribute keywords with context
+ATTRIBUTE_KEYWORDS = MappingProxyType({
+    "dimension": {
+        "terms": ["height", "width", "length", "thickness", "diameter", "radius"],
+        "units": ["mm", "cm", "m", "inch", "ft"],
+        "comparators": ["greater than", "less than", "equal to", "at least", "at most"]
+    },
+    "location": {
+        "terms": ["position", "placement", "coordinate", "location", "elevation"],
+        "spatial": ["above", "below", "next to", "between", "adjacent"],
+        "reference": ["ground", "floor", "ceiling", "wall"]
+    },
+    "material": {
+        "terms": ["material", "composition", "made of", "constructed from"],
+        "types": ["concrete", "steel", "wood", "glass", "aluminum"]
+    },
+    "performance": {
+        "terms": ["rating", "class", "grade", "performance"],
+        "metrics": ["fire", "acoustic", "thermal", "structural"]
+    },
+    "relationship": {
+        "terms": ["connected", "adjacent", "attached", "contains", "supports"],
+        "types": ["structural", "spatial", "logical", "physical"]
+    }
+})
+
+# Relationship mapping for component connections
+RELATIONSHIP_MAPPING = MappingProxyType({
+    "supports": {"inverse": "supported by", "structural": True},
+    "contains": {"inverse": "contained in", "spatial": True},
+    "connects": {"inverse": "connected to", "bidirectional": True},
+    "adjacent": {"inverse": "adjacent to", "bidirectional": True},
+    "hosts": {"inverse": "hosted by", "physical": True}
+})
+
+# Spatial operators for location-based queries
+SPATIAL_OPERATORS = MappingProxyType({
+    "above": {"axis": "z", "comparison": ">"},
+    "below": {"axis": "z", "comparison": "<"},
+    "next_to": {"axis": ["x", "y"], "distance": "near"},
+    "between": {"type": "range", "axes": ["x", "y", "z"]},
+    "inside": {"type": "containment", "check": "boundaries"}
+})
+
+# Building codes in force for each selectable location
+LOCATIONS = MappingProxyType({
+    "California": {
+        "code_version": "2022 California Building Code",
+        "jurisdiction": "California Building Standards Commission",
+        "units": "imperial"
+    },
+    "New York": {
+        "code_version": "2022 NYC Building Code",
+        "jurisdiction": "NYC Department of Buildings",
+        "units": "imperial"
+    },
+    "Texas": {
+        "code_version": "2021 International Building Code with Texas Amendments",
+        "jurisdiction": "Texas Department of Licensing and Regulation",
+        "units": "imperial"
+    },
+    "International": {
+        "code_version": "2021 International Building Code",
+        "jurisdiction": "International Code Council",
+        "units": "metric"
+    }
+})
+LOCATION_OPTIONS = tuple(LOCATIONS)
+
+# Expanded IFC schema with comprehensive component information
+IFC_SCHEMA = MappingProxyType({
+    "IfcWall": {
+        "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
+        "properties": ["Height", "Width", "Length", "Material", "FireRating", "LoadBearing", "Insulation", "ThermalTransmittance", "AcousticRating", "Combustible", "SurfaceSpreadOfFlame", "ExtendToStructure", "LoadBearing", "Compartmentation"],
+        "quantities": ["GrossFootprintArea", "NetVolume", "GrossVolume", "NetWeight", "GrossWeight", "GrossSideArea", "NetSideArea"],
+        "relationships": ["ContainedInStructure", "HasOpenings", "ProvidesVoids", "HasCoverings", "HasProjections", "HasAssociations"],
+        "requirements": {
+            "FireRating": {
+                "value": "2 hours",
+                "description": "Minimum fire rating for load-bearing walls",
+                "code_reference": "CBC Section 703.2"
+            },
+            "Insulation": {
+                "value": "R-13",
+                "description": "Minimum R-value for exterior walls",
+                "code_reference": "CBC Energy Code"
+            },
+            "Height": {
+                "value": "20 feet",
+                "description": "Maximum height between lateral supports",
+                "code_reference": "CBC Section 2109.2"
+            },
+            "Thickness": {
+                "value": "4 inches",
+                "description": "Minimum thickness for load-bearing walls",
+                "code_reference": "CBC Section 2109.1.1"
+            },
+            "AcousticRating": {
+                "value": "STC 50",
+                "description": "Minimum Sound Transmission Class rating for dwelling unit separation",
+                "code_reference": "CBC Section 1206.2"
+            }
         }
-        
-        # Enhanced attribute keywords with context
-        self.attribute_keywords = {
-            "dimension": {
-                "terms": ["height", "width", "length", "thickness", "diameter", "radius"],
-                "units": ["mm", "cm", "m", "inch", "ft"],
-                "comparators": ["greater than", "less than", "equal to", "at least", "at most"]
+    },
+    "IfcStair": {
+        "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
+        "properties": ["NumberOfRiser", "NumberOfTreads", "RiserHeight", "TreadLength", "WalkingLineOffset", "TreadLengthAtOffset", "NosingLength", "WaistThickness", "Material"],
+        "quantities": ["Length", "GrossVolume", "NetVolume", "GrossWeight", "NetWeight"],
+        "relationships": ["ContainedInStructure", "HasCoverings", "HasAssociations"],
+        "requirements": {
+            "RiserHeight": {
+                "value": "4-7 inches",
+                "description": "Maximum riser height for stairs",
+                "code_reference": "CBC Section 1011.5.2"
             },
-            "location": {
-                "terms": ["position", "placement", "coordinate", "location", "elevation"],
-                "spatial": ["above", "below", "next to", "between", "adjacent"],
-                "reference": ["ground", "floor", "ceiling", "wall"]
+            "TreadDepth": {
+                "value": "11 inches minimum",
+                "description": "Minimum tread depth",
+                "code_reference": "CBC Section 1011.5.2"
             },
-            "material": {
-                "terms": ["material", "composition", "made of", "constructed from"],
-                "types": ["concrete", "steel", "wood", "glass", "aluminum"]
+            "Width": {
+                "value": "44 inches minimum",
+                "description": "Minimum width for public stairs",
+                "code_reference": "CBC Section 1011.2"
             },
-            "performance": {
-                "terms": ["rating", "class", "grade", "performance"],
-                "metrics": ["fire", "acoustic", "thermal", "structural"]
+            "Headroom": {
+                "value": "80 inches minimum",
+                "description": "Minimum headroom clearance",
+                "code_reference": "CBC Section 1011.3"
+            }
+        }
+    },
+    "IfcWindow": {
+        "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
+        "properties": ["Height", "Width", "OperationType", "Material", "ThermalTransmittance", "GlazingAreas", "IsExternal", "FireRating", "SecurityRating", "SmokeStop"],
+        "quantities": ["Area", "Weight"],
+        "relationships": ["ContainedInStructure", "FillsVoid", "HasCoverings"],
+        "requirements": {
+            "EmergencyEgress": {
+                "value": "5.7 sq ft minimum",
+                "description": "Minimum clear opening area for emergency escape",
+                "code_reference": "CBC Section 1030.2"
+            },
+            "SillHeight": {
+                "value": "44 inches maximum",
+                "description": "Maximum sill height from floor",
+                "code_reference": "CBC Section 1030.3"
             },
-            "relationship": {
-                "terms": ["connected", "adjacent", "attached", "contains", "supports"],
-                "types": ["structural", "spatial", "logical", "physical"]
+            "OpeningWidth": {
+                "value": "20 inches minimum",
+                "description": "Minimum clear opening width",
+                "code_reference": "CBC Section 1030.2.1"
+            },
+            "OpeningHeight": {
+                "value": "24 inches minimum",
+                "description": "Minimum clear opening height",
+                "code_reference": "CBC Section 1030.2.1"
             }
         }
-        
-        # Relationship mapping for component connections
-        self.relationship_mapping = {
-            "supports": {"inverse": "supported by", "structural": True},
-            "contains": {"inverse": "contained in", "spatial": True},
-            "connects": {"inverse": "connected to", "bidirectional": True},
-            "adjacent": {"inverse": "adjacent to", "bidirectional": True},
-            "hosts": {"inverse": "hosted by", "physical": True}
+    },
+    "IfcColumn": {
+        "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
+        "properties": ["Height", "Width", "Depth", "Material", "LoadBearing", "FireRating", "SectionProfile", "StructuralMaterial"],
+        "quantities": ["Length", "CrossSectionArea", "OuterSurfaceArea", "GrossVolume", "NetVolume", "GrossWeight", "NetWeight"],
+        "relationships": ["ContainedInStructure", "HasAssociations", "HasConnections"],
+        "requirements": {
+            "FireProtection": {
+                "value": "1-3 hours",
+                "description": "Fire-resistance rating based on building type",
+                "code_reference": "CBC Table 601"
+            },
+            "Reinforcement": {
+                "value": "1-4% of gross area",
+                "description": "Required steel reinforcement for concrete columns",
+                "code_reference": "ACI 318-19"
+            },
+            "TieSpacing": {
+                "value": "16 bar diameters maximum",
+                "description": "Maximum spacing of lateral ties",
+                "code_reference": "ACI 318-19 Section 25.7.2"
+            }
         }
-        
-        # Spatial operators for location-based queries
-        self.spatial_operators = {
-            "above": {"axis": "z", "comparison": ">"},
-            "below": {"axis": "z", "comparison": "<"},
-            "next_to": {"axis": ["x", "y"], "distance": "near"},
-            "between": {"type": "range", "axes": ["x", "y", "z"]},
-            "inside": {"type": "containment", "check": "boundaries"}
+    },
+    "IfcBeam": {
+        "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
+        "properties": ["Height", "Width", "Length", "Material", "LoadBearing", "FireRating", "SectionProfile", "StructuralMaterial", "SpanLength", "RollRadius", "Slope"],
+        "quantities": ["Length", "CrossSectionArea", "OuterSurfaceArea", "GrossVolume", "NetVolume", "GrossWeight", "NetWeight"],
+        "relationships": ["ContainedInStructure", "HasAssociations", "HasConnections", "HasCoverings"],
+        "requirements": {
+            "FireProtection": {
+                "value": "1-3 hours",
+                "description": "Fire-resistance rating based on building type",
+                "code_reference": "CBC Table 601"
+            },
+            "LoadBearing": {
+                "value": "Required",
+                "description": "Must be designed to support structural loads",
+                "code_reference": "CBC Section 1604"
+            },
+            "MinimumDepth": {
+                "value": "L/24",
+                "description": "Minimum depth for deflection control (L = span length)",
+                "code_reference": "ACI 318-19"
+            }
         }
-        
-        self.locations = {
-            "California": {
-                "code_version": "2022 California Building Code",
-                "jurisdiction": "California Building Standards Commission",
-                "units": "imperial"
+    },
+    "IfcRoof": {
+        "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
+        "properties": ["Material", "ThermalTransmittance", "IsExternal", "FireRating", "LoadBearing", "PitchAngle", "ProjectedArea", "SurfaceArea"],
+        "quantities": ["GrossArea", "NetArea", "GrossVolume", "NetVolume", "Weight", "Perimeter"],
+        "relationships": ["ContainedInStructure", "HasCoverings", "HasAssociations", "HasOpenings"],
+        "requirements": {
+            "MinimumSlope": {
+                "value": "1/4:12",
+                "description": "Minimum slope for drainage",
+                "code_reference": "CBC Section 1507"
             },
-            "New York": {
-                "code_version": "2022 NYC Building Code",
-                "jurisdiction": "NYC Department of Buildings",
-                "units": "imperial"
+            "FireRating": {
+                "value": "Class A, B, or C",
+                "description": "Required fire classification for roof assemblies",
+                "code_reference": "CBC Section 1505"
             },
-            "Texas": {
-                "code_version": "2021 International Building Code with Texas Amendments",
-                "jurisdiction": "Texas Department of Licensing and Regulation",
-                "units": "imperial"
+            "ThermalValue": {
+                "value": "R-30ci",
+                "description": "Minimum thermal resistance for insulation",
+                "code_reference": "CBC Energy Code"
+            }
+        }
+    },
+    "IfcSlab": {
+        "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
+        "properties": ["Material", "Thickness", "FireRating", "LoadBearing", "ThermalTransmittance", "AcousticRating", "SurfaceSpreadOfFlame"],
+        "quantities": ["GrossArea", "NetArea", "GrossVolume", "NetVolume", "GrossWeight", "NetWeight", "Perimeter"],
+        "relationships": ["ContainedInStructure", "HasCoverings", "HasAssociations", "HasOpenings"],
+        "requirements": {
+            "MinimumThickness": {
+                "value": "4 inches",
+                "description": "Minimum thickness for structural concrete slabs",
+                "code_reference": "ACI 318-19"
             },
-            "International": {
-                "code_version": "2021 International Building Code",
-                "jurisdiction": "International Code Council",
-                "units": "metric"
+            "Reinforcement": {
+                "value": "As per design",
+                "description": "Minimum reinforcement requirements",
+                "code_reference": "ACI 318-19 Section 7.6"
+            },
+            "FireRating": {
+                "value": "2 hours",
+                "description": "Minimum fire rating for floor assemblies",
+                "code_reference": "CBC Section 711"
             }
         }
-        
-        self.current_location = "California"
-        # Expanded IFC schema with comprehensive component information
-        self.ifc_schema = {
-            "IfcWall": {
-                "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
-                "properties": ["Height", "Width", "Length", "Material", "FireRating", "LoadBearing", "Insulation", "ThermalTransmittance", "AcousticRating", "Combustible", "SurfaceSpreadOfFlame", "ExtendToStructure", "LoadBearing", "Compartmentation"],
-                "quantities": ["GrossFootprintArea", "NetVolume", "GrossVolume", "NetWeight", "GrossWeight", "GrossSideArea", "NetSideArea"],
-                "relationships": ["ContainedInStructure", "HasOpenings", "ProvidesVoids", "HasCoverings", "HasProjections", "HasAssociations"],
-                "requirements": {
-                    "FireRating": {
-                        "value": "2 hours",
-                        "description": "Minimum fire rating for load-bearing walls",
-                        "code_reference": "CBC Section 703.2"
-                    },
-                    "Insulation": {
-                        "value": "R-13",
-                        "description": "Minimum R-value for exterior walls",
-                        "code_reference": "CBC Energy Code"
-                    },
-                    "Height": {
-                        "value": "20 feet",
-                        "description": "Maximum height between lateral supports",
-                        "code_reference": "CBC Section 2109.2"
-                    },
-                    "Thickness": {
-                        "value": "4 inches",
-                        "description": "Minimum thickness for load-bearing walls",
-                        "code_reference": "CBC Section 2109.1.1"
-                    },
-                    "AcousticRating": {
-                        "value": "STC 50",
-                        "description": "Minimum Sound Transmission Class rating for dwelling unit separation",
-                        "code_reference": "CBC Section 1206.2"
-                    }
-                }
+    },
+    "IfcRailing": {
+        "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
+        "properties": ["Height", "Material", "HandicapAccessible", "IsExternal", "LoadBearing", "FireRating"],
+        "quantities": ["Length", "GrossVolume", "NetVolume", "GrossWeight", "NetWeight"],
+        "relationships": ["ContainedInStructure", "HasAssociations"],
+        "requirements": {
+            "Height": {
+                "value": "42 inches",
+                "description": "Minimum height for guards",
+                "code_reference": "CBC Section 1015.3"
             },
-            "IfcStair": {
-                "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
-                "properties": ["NumberOfRiser", "NumberOfTreads", "RiserHeight", "TreadLength", "WalkingLineOffset", "TreadLengthAtOffset", "NosingLength", "WaistThickness", "Material"],
-                "quantities": ["Length", "GrossVolume", "NetVolume", "GrossWeight", "NetWeight"],
-                "relationships": ["ContainedInStructure", "HasCoverings", "HasAssociations"],
-                "requirements": {
-                    "RiserHeight": {
-                        "value": "4-7 inches",
-                        "description": "Maximum riser height for stairs",
-                        "code_reference": "CBC Section 1011.5.2"
-                    },
-                    "TreadDepth": {
-                        "value": "11 inches minimum",
-                        "description": "Minimum tread depth",
-                        "code_reference": "CBC Section 1011.5.2"
-                    },
-                    "Width": {
-                        "value": "44 inches minimum",
-                        "description": "Minimum width for public stairs",
-                        "code_reference": "CBC Section 1011.2"
-                    },
-                    "Headroom": {
-                        "value": "80 inches minimum",
-                        "description": "Minimum headroom clearance",
-                        "code_reference": "CBC Section 1011.3"
-                    }
-                }
+            "OpeningSize": {
+                "value": "4 inches maximum",
+                "description": "Maximum opening size in guards",
+                "code_reference": "CBC Section 1015.4"
             },
-            "IfcWindow": {
-                "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
-                "properties": ["Height", "Width", "OperationType", "Material", "ThermalTransmittance", "GlazingAreas", "IsExternal", "FireRating", "SecurityRating", "SmokeStop"],
-                "quantities": ["Area", "Weight"],
-                "relationships": ["ContainedInStructure", "FillsVoid", "HasCoverings"],
-                "requirements": {
-                    "EmergencyEgress": {
-                        "value": "5.7 sq ft minimum",
-                        "description": "Minimum clear opening area for emergency escape",
-                        "code_reference": "CBC Section 1030.2"
-                    },
-                    "SillHeight": {
-                        "value": "44 inches maximum",
-                        "description": "Maximum sill height from floor",
-                        "code_reference": "CBC Section 1030.3"
-                    },
-                    "OpeningWidth": {
-                        "value": "20 inches minimum",
-                        "description": "Minimum clear opening width",
-                        "code_reference": "CBC Section 1030.2.1"
-                    },
-                    "OpeningHeight": {
-                        "value": "24 inches minimum",
-                        "description": "Minimum clear opening height",
-                        "code_reference": "CBC Section 1030.2.1"
-                    }
-                }
+            "LoadResistance": {
+                "value": "50 pounds per linear foot",
+                "description": "Minimum load resistance for handrails",
+                "code_reference": "CBC Section 1607.8"
+            }
+        }
+    },
+    "IfcDoor": {
+        "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
+        "properties": ["Height", "Width", "FireRating", "AccessibilityCompliant", "Operation", "Material", "IsExternal", "ThermalTransmittance", "SmokeControl"],
+        "quantities": ["Height", "Width", "Area", "Weight"],
+        "relationships": ["ContainedInStructure", "FillsOpening", "HasCoverings"],
+        "requirements": {
+            "Width": {
+                "value": "32 inches",
+                "description": "Minimum clear width for accessibility",
+                "code_reference": "CBC Chapter 11B-404.2.3"
             },
-            "IfcColumn": {
-                "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
-                "properties": ["Height", "Width", "Depth", "Material", "LoadBearing", "FireRating", "SectionProfile", "StructuralMaterial"],
-                "quantities": ["Length", "CrossSectionArea", "OuterSurfaceArea", "GrossVolume", "NetVolume", "GrossWeight", "NetWeight"],
-                "relationships": ["ContainedInStructure", "HasAssociations", "HasConnections"],
-                "requirements": {
-                    "FireProtection": {
-                        "value": "1-3 hours",
-                        "description": "Fire-resistance rating based on building type",
-                        "code_reference": "CBC Table 601"
-                    },
-                    "Reinforcement": {
-                        "value": "1-4% of gross area",
-                        "description": "Required steel reinforcement for concrete columns",
-                        "code_reference": "ACI 318-19"
-                    },
-                    "TieSpacing": {
-                        "value": "16 bar diameters maximum",
-                        "description": "Maximum spacing of lateral ties",
-                        "code_reference": "ACI 318-19 Section 25.7.2"
-                    }
-                }
+            "Height": {
+                "value": "80 inches",
+                "description": "Minimum door height",
+                "code_reference": "CBC Section 1010.1.1"
+            },
+            "FireRating": {
+                "value": "90 minutes",
+                "description": "Required rating for exit enclosures",
+                "code_reference": "CBC Section 716.1"
+            },
+            "Threshold": {
+                "value": "0.5 inches",
+                "description": "Maximum threshold height",
+                "code_reference": "CBC Chapter 11B-404.2.5"
+            },
+            "ClosingSpeed": {
+                "value": "5 seconds",
+                "description": "Minimum time to close from 90 degrees",
+                "code_reference": "CBC Chapter 11B-404.2.8"
             }
         }
-        
-        self.property_units = {
-            "Height": "mm",
-            "Width": "mm",
-            "Length": "mm",
-            "Depth": "mm",
-            "Thickness": "mm",
-            "Diameter": "mm",
-            "Area": "m²",
-            "Volume": "m³",
-            "Weight": "kg",
-            "PressureRating": "psi",
-            "FlowRate": "gpm",
-            "LoadBearing": "boolean",
-            "FireRating": "hours",
-            "ThermalTransmittance": "W/(m²·K)",
-            "NominalDiameter": "mm",
-            "RiserHeight": "inches",
-            "TreadLength": "inches",
-            "NosingLength": "inches",
-            "WaistThickness": "inches",
-            "OpeningArea": "sq ft",
-            "SillHeight": "inches",
-            "OpeningWidth": "inches",
-            "OpeningHeight": "inches",
-            "CrossSectionArea": "sq in",
-            "OuterSurfaceArea": "sq ft",
-            "SectionProfile": "designation",
-            "AcousticRating": "STC",
-            "GlazingAreas": "sq ft"
+    },
+    "IfcCovering": {
+        "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
+        "properties": ["Material", "Thickness", "FireRating", "AcousticRating", "SurfaceSpreadOfFlame", "ThermalTransmittance"],
+        "quantities": ["GrossArea", "NetArea", "GrossVolume", "NetVolume", "Weight"],
+        "relationships": ["CoversSpaces", "CoversElements", "HasAssociations"],
+        "requirements": {
+            "FireRating": {
+                "value": "As required",
+                "description": "Fire rating based on assembly type",
+                "code_reference": "CBC Section 703"
+            },
+            "FlameSpread": {
+                "value": "Class A, B, or C",
+                "description": "Surface burning characteristics",
+                "code_reference": "CBC Section 803"
+            },
+            "AcousticRating": {
+                "value": "NRC 0.70",
+                "description": "Minimum noise reduction coefficient for acoustic ceilings",
+                "code_reference": "ASTM C423"
+            }
         }
-        
-        self.current_file = None
-        self.extracted_data = {}
-        self.user_data = {}
-        
-        self.ifc_schema.update({
-            "IfcBeam": {
-                "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
-                "properties": ["Height", "Width", "Length", "Material", "LoadBearing", "FireRating", "SectionProfile", "StructuralMaterial", "SpanLength", "RollRadius", "Slope"],
-                "quantities": ["Length", "CrossSectionArea", "OuterSurfaceArea", "GrossVolume", "NetVolume", "GrossWeight", "NetWeight"],
-                "relationships": ["ContainedInStructure", "HasAssociations", "HasConnections", "HasCoverings"],
-                "requirements": {
-                    "FireProtection": {
-                        "value": "1-3 hours",
-                        "description": "Fire-resistance rating based on building type",
-                        "code_reference": "CBC Table 601"
-                    },
-                    "LoadBearing": {
-                        "value": "Required",
-                        "description": "Must be designed to support structural loads",
-                        "code_reference": "CBC Section 1604"
-                    },
-                    "MinimumDepth": {
-                        "value": "L/24",
-                        "description": "Minimum depth for deflection control (L = span length)",
-                        "code_reference": "ACI 318-19"
-                    }
-                }
+    },
+    "IfcPipe": {
+        "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
+        "properties": ["NominalDiameter", "Material", "WorkingPressure", "Temperature", "FlowDirection", "IsExternal", "HasInsulation"],
+        "quantities": ["Length", "CrossSectionArea", "OuterSurfaceArea", "GrossWeight"],
+        "relationships": ["ContainedInStructure", "HasPorts", "HasAssociations"],
+        "requirements": {
+            "MinimumSlope": {
+                "value": "1/4 inch per foot",
+                "description": "Minimum slope for drainage pipes",
+                "code_reference": "UPC Section 708.0"
             },
-            "IfcRoof": {
-                "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
-                "properties": ["Material", "ThermalTransmittance", "IsExternal", "FireRating", "LoadBearing", "PitchAngle", "ProjectedArea", "SurfaceArea"],
-                "quantities": ["GrossArea", "NetArea", "GrossVolume", "NetVolume", "Weight", "Perimeter"],
-                "relationships": ["ContainedInStructure", "HasCoverings", "HasAssociations", "HasOpenings"],
-                "requirements": {
-                    "MinimumSlope": {
-                        "value": "1/4:12",
-                        "description": "Minimum slope for drainage",
-                        "code_reference": "CBC Section 1507"
-                    },
-                    "FireRating": {
-                        "value": "Class A, B, or C",
-                        "description": "Required fire classification for roof assemblies",
-                        "code_reference": "CBC Section 1505"
-                    },
-                    "ThermalValue": {
-                        "value": "R-30ci",
-                        "description": "Minimum thermal resistance for insulation",
-                        "code_reference": "CBC Energy Code"
-                    }
-                }
+            "Material": {
+                "value": "Approved materials",
+                "description": "Approved materials for water distribution",
+                "code_reference": "UPC Section 604.1"
             },
-            "IfcSlab": {
-                "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
-                "properties": ["Material", "Thickness", "FireRating", "LoadBearing", "ThermalTransmittance", "AcousticRating", "SurfaceSpreadOfFlame"],
-                "quantities": ["GrossArea", "NetArea", "GrossVolume", "NetVolume", "GrossWeight", "NetWeight", "Perimeter"],
-                "relationships": ["ContainedInStructure", "HasCoverings", "HasAssociations", "HasOpenings"],
-                "requirements": {
-                    "MinimumThickness": {
-                        "value": "4 inches",
-                        "description": "Minimum thickness for structural concrete slabs",
-                        "code_reference": "ACI 318-19"
-                    },
-                    "Reinforcement": {
-                        "value": "As per design",
-                        "description": "Minimum reinforcement requirements",
-                        "code_reference": "ACI 318-19 Section 7.6"
-                    },
-                    "FireRating": {
-                        "value": "2 hours",
-                        "description": "Minimum fire rating for floor assemblies",
-                        "code_reference": "CBC Section 711"
-                    }
-                }
+            "Insulation": {
+                "value": "R-3",
+                "description": "Minimum insulation for hot water pipes",
+                "code_reference": "Energy Code"
+            }
+        }
+    },
+    "IfcDuctSegment": {
+        "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
+        "properties": ["CrossSectionShape", "Width", "Height", "Material", "AirFlow", "Velocity", "PressureDrop", "HasInsulation"],
+        "quantities": ["Length", "CrossSectionArea", "OuterSurfaceArea", "GrossWeight"],
+        "relationships": ["ContainedInStructure", "HasPorts", "HasAssociations"],
+        "requirements": {
+            "Velocity": {
+                "value": "2000 fpm maximum",
+                "description": "Maximum air velocity in main ducts",
+                "code_reference": "ASHRAE Fundamentals"
             },
-            "IfcRailing": {
-                "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
-                "properties": ["Height", "Material", "HandicapAccessible", "IsExternal", "LoadBearing", "FireRating"],
-                "quantities": ["Length", "GrossVolume", "NetVolume", "GrossWeight", "NetWeight"],
-                "relationships": ["ContainedInStructure", "HasAssociations"],
-                "requirements": {
-                    "Height": {
-                        "value": "42 inches",
-                        "description": "Minimum height for guards",
-                        "code_reference": "CBC Section 1015.3"
-                    },
-                    "OpeningSize": {
-                        "value": "4 inches maximum",
-                        "description": "Maximum opening size in guards",
-                        "code_reference": "CBC Section 1015.4"
-                    },
-                    "LoadResistance": {
-                        "value": "50 pounds per linear foot",
-                        "description": "Minimum load resistance for handrails",
-                        "code_reference": "CBC Section 1607.8"
-                    }
-                }
+            "Insulation": {
+                "value": "R-6",
+                "description": "Minimum insulation for supply ducts in unconditioned spaces",
+                "code_reference": "Energy Code"
             },
-            "IfcDoor": {
-                "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
-                "properties": ["Height", "Width", "FireRating", "AccessibilityCompliant", "Operation", "Material", "IsExternal", "ThermalTransmittance", "SmokeControl"],
-                "quantities": ["Height", "Width", "Area", "Weight"],
-                "relationships": ["ContainedInStructure", "FillsOpening", "HasCoverings"],
-                "requirements": {
-                    "Width": {
-                        "value": "32 inches",
-                        "description": "Minimum clear width for accessibility",
-                        "code_reference": "CBC Chapter 11B-404.2.3"
-                    },
-                    "Height": {
-                        "value": "80 inches",
-                        "description": "Minimum door height",
-                        "code_reference": "CBC Section 1010.1.1"
-                    },
-                    "FireRating": {
-                        "value": "90 minutes",
-                        "description": "Required rating for exit enclosures",
-                        "code_reference": "CBC Section 716.1"
-                    },
-                    "Threshold": {
-                        "value": "0.5 inches",
-                        "description": "Maximum threshold height",
-                        "code_reference": "CBC Chapter 11B-404.2.5"
-                    },
-                    "ClosingSpeed": {
-                        "value": "5 seconds",
-                        "description": "Minimum time to close from 90 degrees",
-                        "code_reference": "CBC Chapter 11B-404.2.8"
-                    }
-                }
+            "Material": {
+                "value": "Galvanized steel",
+                "description": "Standard material requirement",
+                "code_reference": "SMACNA Standards"
+            }
+        }
+    },
+    "IfcLightFixture": {
+        "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
+        "properties": ["PowerConsumption", "LightOutput", "ColorTemperature", "EmergencyBallast", "DimmingCapability", "LampType"],
+        "quantities": ["GrossWeight"],
+        "relationships": ["ContainedInStructure", "HasPorts", "HasAssociations"],
+        "requirements": {
+            "EmergencyLighting": {
+                "value": "90 minutes",
+                "description": "Minimum emergency operation time",
+                "code_reference": "CBC Section 1008.3"
             },
-            "IfcCovering": {
-                "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
-                "properties": ["Material", "Thickness", "FireRating", "AcousticRating", "SurfaceSpreadOfFlame", "ThermalTransmittance"],
-                "quantities": ["GrossArea", "NetArea", "GrossVolume", "NetVolume", "Weight"],
-                "relationships": ["CoversSpaces", "CoversElements", "HasAssociations"],
-                "requirements": {
-                    "FireRating": {
-                        "value": "As required",
-                        "description": "Fire rating based on assembly type",
-                        "code_reference": "CBC Section 703"
-                    },
-                    "FlameSpread": {
-                        "value": "Class A, B, or C",
-                        "description": "Surface burning characteristics",
-                        "code_reference": "CBC Section 803"
-                    },
-                    "AcousticRating": {
-                        "value": "NRC 0.70",
-                        "description": "Minimum noise reduction coefficient for acoustic ceilings",
-                        "code_reference": "ASTM C423"
-                    }
-                }
+            "IlluminationLevel": {
+                "value": "1 footcandle average",
+                "description": "Minimum illumination for egress",
+                "code_reference": "CBC Section 1008.2.1"
             },
-            "IfcPipe": {
-                "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
-                "properties": ["NominalDiameter", "Material", "WorkingPressure", "Temperature", "FlowDirection", "IsExternal", "HasInsulation"],
-                "quantities": ["Length", "CrossSectionArea", "OuterSurfaceArea", "GrossWeight"],
-                "relationships": ["ContainedInStructure", "HasPorts", "HasAssociations"],
-                "requirements": {
-                    "MinimumSlope": {
-                        "value": "1/4 inch per foot",
-                        "description": "Minimum slope for drainage pipes",
-                        "code_reference": "UPC Section 708.0"
-                    },
-                    "Material": {
-                        "value": "Approved materials",
-                        "description": "Approved materials for water distribution",
-                        "code_reference": "UPC Section 604.1"
-                    },
-                    "Insulation": {
-                        "value": "R-3",
-                        "description": "Minimum insulation for hot water pipes",
-                        "code_reference": "Energy Code"
-                    }
-                }
+            "EnergyEfficiency": {
+                "value": "90 lumens/watt",
+                "description": "Minimum luminous efficacy",
+                "code_reference": "Energy Code"
+            }
+        }
+    },
+    "IfcSanitaryTerminal": {
+        "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
+        "properties": ["Material", "MountingHeight", "WaterConsumption", "AccessibilityCompliant", "HasSensor"],
+        "quantities": ["GrossWeight"],
+        "relationships": ["ContainedInStructure", "HasPorts", "HasAssociations"],
+        "requirements": {
+            "WaterConsumption": {
+                "value": "1.28 gpf",
+                "description": "Maximum water consumption for toilets",
+                "code_reference": "UPC Section 411.2"
             },
-            "IfcDuctSegment": {
-                "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
-                "properties": ["CrossSectionShape", "Width", "Height", "Material", "AirFlow", "Velocity", "PressureDrop", "HasInsulation"],
-                "quantities": ["Length", "CrossSectionArea", "OuterSurfaceArea", "GrossWeight"],
-                "relationships": ["ContainedInStructure", "HasPorts", "HasAssociations"],
-                "requirements": {
-                    "Velocity": {
-                        "value": "2000 fpm maximum",
-                        "description": "Maximum air velocity in main ducts",
-                        "code_reference": "ASHRAE Fundamentals"
-                    },
-                    "Insulation": {
-                        "value": "R-6",
-                        "description": "Minimum insulation for supply ducts in unconditioned spaces",
-                        "code_reference": "Energy Code"
-                    },
-                    "Material": {
-                        "value": "Galvanized steel",
-                        "description": "Standard material requirement",
-                        "code_reference": "SMACNA Standards"
-                    }
-                }
+            "MountingHeight": {
+                "value": "17-19 inches",
+                "description": "Toilet seat height for accessibility",
+                "code_reference": "CBC Chapter 11B-604.4"
             },
-            "IfcLightFixture": {
-                "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
-                "properties": ["PowerConsumption", "LightOutput", "ColorTemperature", "EmergencyBallast", "DimmingCapability", "LampType"],
-                "quantities": ["GrossWeight"],
-                "relationships": ["ContainedInStructure", "HasPorts", "HasAssociations"],
-                "requirements": {
-                    "EmergencyLighting": {
-                        "value": "90 minutes",
-                        "description": "Minimum emergency operation time",
-                        "code_reference": "CBC Section 1008.3"
-                    },
-                    "IlluminationLevel": {
-                        "value": "1 footcandle average",
-                        "description": "Minimum illumination for egress",
-                        "code_reference": "CBC Section 1008.2.1"
-                    },
-                    "EnergyEfficiency": {
-                        "value": "90 lumens/watt",
-                        "description": "Minimum luminous efficacy",
-                        "code_reference": "Energy Code"
-                    }
-                }
+            "ClearFloorSpace": {
+                "value": "60 x 56 inches",
+                "description": "Minimum clear floor space at water closets",
+                "code_reference": "CBC Chapter 11B-604.3"
+            }
+        }
+    },
+    "IfcFireSuppressionTerminal": {
+        "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
+        "properties": ["CoverageArea", "Temperature", "DischargePattern", "FlowRate", "PressureRating", "ResponseTime"],
+        "quantities": ["GrossWeight"],
+        "relationships": ["ContainedInStructure", "HasPorts", "HasAssociations"],
+        "requirements": {
+            "Coverage": {
+                "value": "225 sq ft maximum",
+                "description": "Maximum coverage area per sprinkler",
+                "code_reference": "NFPA 13"
             },
-            "IfcSanitaryTerminal": {
-                "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
-                "properties": ["Material", "MountingHeight", "WaterConsumption", "AccessibilityCompliant", "HasSensor"],
-                "quantities": ["GrossWeight"],
-                "relationships": ["ContainedInStructure", "HasPorts", "HasAssociations"],
-                "requirements": {
-                    "WaterConsumption": {
-                        "value": "1.28 gpf",
-                        "description": "Maximum water consumption for toilets",
-                        "code_reference": "UPC Section 411.2"
-                    },
-                    "MountingHeight": {
-                        "value": "17-19 inches",
-                        "description": "Toilet seat height for accessibility",
-                        "code_reference": "CBC Chapter 11B-604.4"
-                    },
-                    "ClearFloorSpace": {
-                        "value": "60 x 56 inches",
-                        "description": "Minimum clear floor space at water closets",
-                        "code_reference": "CBC Chapter 11B-604.3"
-                    }
-                }
+            "FlowRate": {
+                "value": "0.1 gpm/sq ft",
+                "description": "Minimum design density for light hazard",
+                "code_reference": "NFPA 13"
             },
-            "IfcFireSuppressionTerminal": {
-                "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
-                "properties": ["CoverageArea", "Temperature", "DischargePattern", "FlowRate", "PressureRating", "ResponseTime"],
-                "quantities": ["GrossWeight"],
-                "relationships": ["ContainedInStructure", "HasPorts", "HasAssociations"],
-                "requirements": {
-                    "Coverage": {
-                        "value": "225 sq ft maximum",
-                        "description": "Maximum coverage area per sprinkler",
-                        "code_reference": "NFPA 13"
-                    },
-                    "FlowRate": {
-                        "value": "0.1 gpm/sq ft",
-                        "description": "Minimum design density for light hazard",
-                        "code_reference": "NFPA 13"
-                    },
-                    "Spacing": {
-                        "value": "15 feet maximum",
-                        "description": "Maximum distance between sprinklers",
-                        "code_reference": "NFPA 13"
-                    }
-                }
+            "Spacing": {
+                "value": "15 feet maximum",
+                "description": "Maximum distance between sprinklers",
+                "code_reference": "NFPA 13"
+            }
+        }
+    },
+    "IfcSpace": {
+        "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
+        "properties": ["GrossFloorArea", "NetFloorArea", "GrossVolume", "NetVolume", "NetCeilingHeight", "FinishFloorHeight", "OccupancyType", "OccupancyNumber"],
+        "quantities": ["Height", "FinishCeilingHeight", "GrossPerimeter", "NetPerimeter"],
+        "relationships": ["ContainedInStructure", "HasCoverings", "HasOpenings", "BoundsSpaces"],
+        "requirements": {
+            "MinimumArea": {
+                "value": "70 sq ft",
+                "description": "Minimum floor area for habitable rooms",
+                "code_reference": "CBC Section 1207.3"
             },
-            "IfcSpace": {
-                "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
-                "properties": ["GrossFloorArea", "NetFloorArea", "GrossVolume", "NetVolume", "NetCeilingHeight", "FinishFloorHeight", "OccupancyType", "OccupancyNumber"],
-                "quantities": ["Height", "FinishCeilingHeight", "GrossPerimeter", "NetPerimeter"],
-                "relationships": ["ContainedInStructure", "HasCoverings", "HasOpenings", "BoundsSpaces"],
-                "requirements": {
-                    "MinimumArea": {
-                        "value": "70 sq ft",
-                        "description": "Minimum floor area for habitable rooms",
-                        "code_reference": "CBC Section 1207.3"
-                    },
-                    "MinimumHeight": {
-                        "value": "7 feet 6 inches",
-                        "description": "Minimum ceiling height for habitable spaces",
-                        "code_reference": "CBC Section 1207.2"
-                    },
-                    "Ventilation": {
-                        "value": "0.35 air changes per hour",
-                        "description": "Minimum ventilation rate",
-                        "code_reference": "CBC Section 1202.1"
-                    }
-                }
+            "MinimumHeight": {
+                "value": "7 feet 6 inches",
+                "description": "Minimum ceiling height for habitable spaces",
+                "code_reference": "CBC Section 1207.2"
             },
-            "IfcZone": {
-                "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
-                "properties": ["ZoneType", "OccupancyType", "SecurityLevel", "FireZone", "ThermalZone", "VentilationZone"],
-                "quantities": ["GrossFloorArea", "NetFloorArea", "GrossVolume"],
-                "relationships": ["ContainsSpaces", "HasAssociations"],
-                "requirements": {
-                    "FireCompartment": {
-                        "value": "As required",
-                        "description": "Fire compartment size limitations",
-                        "code_reference": "CBC Section 707"
-                    },
-                    "OccupantLoad": {
-                        "value": "Per Table 1004.5",
-                        "description": "Maximum floor area allowance per occupant",
-                        "code_reference": "CBC Section 1004"
-                    },
-                    "ExitAccess": {
-                        "value": "200 feet maximum",
-                        "description": "Maximum common path of egress travel",
-                        "code_reference": "CBC Section 1006.2.1"
-                    }
-                }
+            "Ventilation": {
+                "value": "0.35 air changes per hour",
+                "description": "Minimum ventilation rate",
+                "code_reference": "CBC Section 1202.1"
+            }
+        }
+    },
+    "IfcZone": {
+        "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
+        "properties": ["ZoneType", "OccupancyType", "SecurityLevel", "FireZone", "ThermalZone", "VentilationZone"],
+        "quantities": ["GrossFloorArea", "NetFloorArea", "GrossVolume"],
+        "relationships": ["ContainsSpaces", "HasAssociations"],
+        "requirements": {
+            "FireCompartment": {
+                "value": "As required",
+                "description": "Fire compartment size limitations",
+                "code_reference": "CBC Section 707"
             },
-            "IfcStairFlight": {
-                "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
-                "properties": ["NumberOfRiser", "NumberOfTreads", "RiserHeight", "TreadLength", "WalkingLineOffset", "TreadLengthAtOffset", "NosingLength"],
-                "quantities": ["Length", "GrossVolume", "NetVolume", "GrossWeight"],
-                "relationships": ["ContainedInStructure", "HasAssociations"],
-                "requirements": {
-                    "RiserHeight": {
-                        "value": "4-7 inches",
-                        "description": "Maximum riser height",
-                        "code_reference": "CBC Section 1011.5.2"
-                    },
-                    "TreadDepth": {
-                        "value": "11 inches minimum",
-                        "description": "Minimum tread depth",
-                        "code_reference": "CBC Section 1011.5.2"
-                    },
-                    "Uniformity": {
-                        "value": "3/8 inch maximum",
-                        "description": "Maximum variation in riser height or tread depth",
-                        "code_reference": "CBC Section 1011.5.4"
-                    }
-                }
+            "OccupantLoad": {
+                "value": "Per Table 1004.5",
+                "description": "Maximum floor area allowance per occupant",
+                "code_reference": "CBC Section 1004"
             },
-            "IfcCurtainWall": {
-                "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
-                "properties": ["ThermalTransmittance", "IsExternal", "FireRating", "AcousticRating", "SecurityRating", "SolarHeatGainCoefficient"],
-                "quantities": ["Height", "Width", "GrossArea", "NetArea"],
-                "relationships": ["ContainedInStructure", "HasOpenings", "HasCoverings"],
-                "requirements": {
-                    "ThermalPerformance": {
-                        "value": "U-0.36",
-                        "description": "Maximum U-factor for fixed fenestration",
-                        "code_reference": "Energy Code Table 140.3-B"
-                    },
-                    "SHGC": {
-                        "value": "0.25",
-                        "description": "Maximum solar heat gain coefficient",
-                        "code_reference": "Energy Code Table 140.3-B"
-                    },
-                    "FireResistance": {
-                        "value": "As required",
-                        "description": "Fire-resistance rating based on separation distance",
-                        "code_reference": "CBC Section 705"
-                    }
-                }
+            "ExitAccess": {
+                "value": "200 feet maximum",
+                "description": "Maximum common path of egress travel",
+                "code_reference": "CBC Section 1006.2.1"
+            }
+        }
+    },
+    "IfcStairFlight": {
+        "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
+        "properties": ["NumberOfRiser", "NumberOfTreads", "RiserHeight", "TreadLength", "WalkingLineOffset", "TreadLengthAtOffset", "NosingLength"],
+        "quantities": ["Length", "GrossVolume", "NetVolume", "GrossWeight"],
+        "relationships": ["ContainedInStructure", "HasAssociations"],
+        "requirements": {
+            "RiserHeight": {
+                "value": "4-7 inches",
+                "description": "Maximum riser height",
+                "code_reference": "CBC Section 1011.5.2"
             },
-            "IfcElectricDistributionBoard": {
-                "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
-                "properties": ["MainVoltage", "NumberOfPhases", "NumberOfCircuits", "RatedCurrent", "IP_Rating", "HasSurgeProtection"],
-                "quantities": ["GrossWeight"],
-                "relationships": ["ContainedInStructure", "HasPorts", "HasAssociations"],
-                "requirements": {
-                    "WorkingSpace": {
-                        "value": "30 inches wide minimum",
-                        "description": "Minimum working space width",
-                        "code_reference": "NEC Article 110.26"
-                    },
-                    "Height": {
-                        "value": "6 feet 6 inches maximum",
-                        "description": "Maximum height to operating handle",
-                        "code_reference": "NEC Article 404.8"
-                    },
-                    "AFCI_Protection": {
-                        "value": "Required",
-                        "description": "Arc-fault circuit protection for specific circuits",
-                        "code_reference": "NEC Article 210.12"
-                    }
-                }
+            "TreadDepth": {
+                "value": "11 inches minimum",
+                "description": "Minimum tread depth",
+                "code_reference": "CBC Section 1011.5.2"
+            },
+            "Uniformity": {
+                "value": "3/8 inch maximum",
+                "description": "Maximum variation in riser height or tread depth",
+                "code_reference": "CBC Section 1011.5.4"
+            }
+        }
+    },
+    "IfcCurtainWall": {
+        "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
+        "properties": ["ThermalTransmittance", "IsExternal", "FireRating", "AcousticRating", "SecurityRating", "SolarHeatGainCoefficient"],
+        "quantities": ["Height", "Width", "GrossArea", "NetArea"],
+        "relationships": ["ContainedInStructure", "HasOpenings", "HasCoverings"],
+        "requirements": {
+            "ThermalPerformance": {
+                "value": "U-0.36",
+                "description": "Maximum U-factor for fixed fenestration",
+                "code_reference": "Energy Code Table 140.3-B"
+            },
+            "SHGC": {
+                "value": "0.25",
+                "description": "Maximum solar heat gain coefficient",
+                "code_reference": "Energy Code Table 140.3-B"
+            },
+            "FireResistance": {
+                "value": "As required",
+                "description": "Fire-resistance rating based on separation distance",
+                "code_reference": "CBC Section 705"
+            }
+        }
+    },
+    "IfcElectricDistributionBoard": {
+        "attributes": ["Name", "Description", "ObjectType", "Tag", "GlobalId"],
+        "properties": ["MainVoltage", "NumberOfPhases", "NumberOfCircuits", "RatedCurrent", "IP_Rating", "HasSurgeProtection"],
+        "quantities": ["GrossWeight"],
+        "relationships": ["ContainedInStructure", "HasPorts", "HasAssociations"],
+        "requirements": {
+            "WorkingSpace": {
+                "value": "30 inches wide minimum",
+                "description": "Minimum working space width",
+                "code_reference": "NEC Article 110.26"
+            },
+            "Height": {
+                "value": "6 feet 6 inches maximum",
+                "description": "Maximum height to operating handle",
+                "code_reference": "NEC Article 404.8"
+            },
+            "AFCI_Protection": {
+                "value": "Required",
+                "description": "Arc-fault circuit protection for specific circuits",
+                "code_reference": "NEC Article 210.12"
             }
-        })
+        }
+    }
+})
+
+# (from unit, to unit) -> multiplier between metric and imperial units
+UNIT_CONVERSIONS = MappingProxyType({
+    ("mm", "inches"): 1 / 25.4,
+    ("inches", "mm"): 25.4,
+    ("m2", "sqft"): 10.764,
+    ("sqft", "m2"): 1 / 10.764,
+    ("m3", "cuft"): 35.315,
+    ("cuft", "m3"): 1 / 35.315,
+    ("kg", "lbs"): 2.205,
+    ("lbs", "kg"): 1 / 2.205
+})
+
+# Display units of IFC property names
+PROPERTY_UNITS = MappingProxyType({
+    "Height": "mm",
+    "Width": "mm",
+    "Length": "mm",
+    "Depth": "mm",
+    "Thickness": "mm",
+    "Diameter": "mm",
+    "Area": "m²",
+    "Volume": "m³",
+    "Weight": "kg",
+    "PressureRating": "psi",
+    "FlowRate": "gpm",
+    "LoadBearing": "boolean",
+    "FireRating": "hours",
+    "ThermalTransmittance": "W/(m²·K)",
+    "NominalDiameter": "mm",
+    "RiserHeight": "inches",
+    "TreadLength": "inches",
+    "NosingLength": "inches",
+    "WaistThickness": "inches",
+    "OpeningArea": "sq ft",
+    "SillHeight": "inches",
+    "OpeningWidth": "inches",
+    "OpeningHeight": "inches",
+    "CrossSectionArea": "sq in",
+    "OuterSurfaceArea": "sq ft",
+    "SectionProfile": "designation",
+    "AcousticRating": "STC",
+    "GlazingAreas": "sq ft",
+    "GrossFloorArea": "sq ft",
+    "NetFloorArea": "sq ft",
+    "GrossVolume": "cu ft",
+    "NetVolume": "cu ft",
+    "NetCeilingHeight": "ft",
+    "FinishFloorHeight": "ft",
+    "OccupancyNumber": "persons",
+    "SecurityLevel": "enum",
+    "SHGC": "coefficient",
+    "MainVoltage": "V",
+    "RatedCurrent": "A",
+    "IP_Rating": "IP##"
+})
+
+_DIMENSIONAL_REQUIREMENT_RE = re.compile("height|width|depth|thickness|length", re.IGNORECASE)
+
+@lru_cache(maxsize=1)
+def requirements_table() -> Tuple[Tuple[str, str, Dict[str, Any]], ...]:
+    """Flatten IFC_SCHEMA's requirements to one (ifc_type, name, requirement) row each, once per process."""
+    return tuple(
+        (entity_type, name, requirement)
+        for entity_type, schema in IFC_SCHEMA.items()
+        for name, requirement in schema.get("requirements", {}).items()
+    )
 
-        # Add new property units
-        self.property_units.update({
-            "GrossFloorArea": "sq ft",
-            "NetFloorArea": "sq ft",
-            "GrossVolume": "cu ft",
-            "NetVolume": "cu ft",
-            "NetCeilingHeight": "ft",
-            "FinishFloorHeight": "ft",
-            "OccupancyNumber": "persons",
-            "SecurityLevel": "enum",
-            "SHGC": "coefficient",
-            "MainVoltage": "V",
-            "RatedCurrent": "A",
-            "IP_Rating": "IP##"
-        })
+@lru_cache(maxsize=1)
+def _entity_hasher():
+    """Term counter for uploaded entities' documents; stateless, so one instance serves every file."""
+    from sklearn.feature_extraction.text import HashingVectorizer
+    return HashingVectorizer(n_features=2**18, alternate_sign=False, norm=None, dtype=np.float32)
+
+@lru_cache(maxsize=None)
+def component_requirements(component: str) -> Tuple[Tuple, Tuple]:
+    """A component's (all, dimensional) code requirements, built once per process and component."""
+    requirements = tuple(
+        (name, requirement) for ifc_type, name, requirement in requirements_table() if ifc_type == component
+    )
+    dimensional = tuple(
+        requirement for requirement in requirements if _DIMENSIONAL_REQUIREMENT_RE.search(requirement[0])
+    )
+    return requirements, dimensional
+
+class IFCAnalyzer:
+    # Fixed instance attributes, stored without a per-instance __dict__
+    __slots__ = (
+        "nlp", "_parse_query",
+        "component_types", "attribute_keywords", "relationship_mapping", "spatial_operators",
+        "locations", "current_location", "ifc_schema", "property_units",
+        "current_file", "extracted_data", "user_data",
+        "_indexed_data", "_types_by_component", "_dimension_rows", "_dimension_names",
+        "_dimension_values", "_dimension_array", "_tfidf", "_entity_matrix",
+        "_entity_terms", "_entity_rows", "_prop_ids", "_props_by_metric", "_prop_presence",
+        "_property_tables", "_search_results",
+    )
+
+    # Value attribute of each simple quantity type read from IfcElementQuantity
+    _QUANTITY_VALUE_ATTRIBUTES = {
+        "IfcQuantityLength": "LengthValue",
+        "IfcQuantityArea": "AreaValue",
+        "IfcQuantityVolume": "VolumeValue"
+    }
+
+    # Inverted indexes from each query term to the (rank, value) it names, so a
+    # token is resolved with dict lookups; ranks keep the source lists' order
+    _component_index = MappingProxyType({
+        variation: (rank, comp_type)
+        for rank, (comp_type, variations) in enumerate(COMPONENT_TYPES.items())
+        for variation in variations
+    })
+    _material_index = MappingProxyType({
+        material: (rank, material) for rank, material in enumerate(ATTRIBUTE_KEYWORDS["material"]["types"])
+    })
+    _metric_index = MappingProxyType({
+        metric: (rank, metric) for rank, metric in enumerate(ATTRIBUTE_KEYWORDS["performance"]["metrics"])
+    })
+    _relationship_index = MappingProxyType({
+        rel_type: (rank, rel_type) for rank, rel_type in enumerate(RELATIONSHIP_MAPPING)
+    })
+
+    # Keyword sets for O(1) membership tests during query preprocessing
+    _unit_terms = frozenset(
+        unit for kw in ATTRIBUTE_KEYWORDS.values() for unit in kw.get("units", [])
+    )
+    _comparator_terms = frozenset(
+        comparator for kw in ATTRIBUTE_KEYWORDS.values() for comparator in kw.get("comparators", [])
+    )
+
+    def __init__(self):
+        self.nlp = load_spacy_model()
+        # Parsed queries are reused when the same search is run again
+        self._parse_query = lru_cache(maxsize=256)(self.nlp)
+        
+        self.component_types = COMPONENT_TYPES
+        self.attribute_keywords = ATTRIBUTE_KEYWORDS
+        self.relationship_mapping = RELATIONSHIP_MAPPING
+        self.spatial_operators = SPATIAL_OPERATORS
+        self.locations = LOCATIONS
+        self.current_location = "California"
+        self.ifc_schema = IFC_SCHEMA
+        self.property_units = PROPERTY_UNITS
         
+        self.current_file = None
+        self.extracted_data = {}
+        self.user_data = {}
+        self._indexed_data = None  # extracted_data the search index below was built from
+        self._types_by_component = {}  # query component -> extracted entity types it names
+        self._dimension_rows = None  # entity row of each dimension-like property value
+        self._dimension_names = []
+        self._dimension_values = []
+        self._dimension_array = None  # the values as floats, NaN where not numeric
+        self._tfidf = None  # IDF weights fitted on the extracted entities, if there are any
+        self._entity_matrix = None
+        self._entity_terms = None  # 0/1 mask of hashed columns seen in the extracted entities
+        self._entity_rows = {}  # entity_type -> first row of its entities in _entity_matrix
+        self._prop_ids = {}  # property name -> column in _prop_presence
+        self._props_by_metric = {}  # performance metric -> property names containing it
+        self._prop_presence = None  # entity row x property name presence matrix
+        self._property_tables = {}  # GlobalId -> rendered property table
+        self._search_results = None  # memoized _search_components for the indexed data
+        
+    @property
+    def lemmatizer(self):
+        """WordNet lemmatizer, loaded with NLTK on first access."""
+        return wordnet_lemmatizer()
+
+    @property
+    def stop_words(self) -> frozenset:
+        """English stopwords, loaded with NLTK on first access."""
+        return english_stopwords()
+
     def set_location(self, location: str) -> bool:
         """Set the current location for building code requirements."""
         if location in self.locations:
@@ -686,37 +889,26 @@ class IFCAnalyzer:
         """Get information about the current location's building codes."""
         return self.locations.get(self.current_location, {})
 
+    def get_component_requirements(self, component: str) -> Tuple[Tuple, Tuple]:
+        """Return a component's (all, dimensional) code requirements."""
+        return component_requirements(component)
+
     def convert_units(self, value: float, from_unit: str, to_unit: str) -> float:
         """Convert measurements between metric and imperial units."""
-        conversions = {
-            "mm_to_inches": lambda x: x / 25.4,
-            "inches_to_mm": lambda x: x * 25.4,
-            "m2_to_sqft": lambda x: x * 10.764,
-            "sqft_to_m2": lambda x: x / 10.764,
-            "m3_to_cuft": lambda x: x * 35.315,
-            "cuft_to_m3": lambda x: x / 35.315,
-            "kg_to_lbs": lambda x: x * 2.205,
-            "lbs_to_kg": lambda x: x / 2.205
-        }
-        
-        conversion_key = f"{from_unit}_to_{to_unit}"
-        if conversion_key in conversions:
-            return conversions[conversion_key](value)
+        factor = UNIT_CONVERSIONS.get((from_unit, to_unit))
+        if factor is not None:
+            return value * factor
         return value
         
     def load_file(self, file_data, file_type: str) -> bool:
         """Load and process uploaded file data."""
         try:
             if file_type == "ifc":
-                # Save IFC file temporarily and load with ifcopenshell
-                temp_path = "temp.ifc"
-                with open(temp_path, "wb") as f:
-                    f.write(file_data)
-                self.current_file = ifcopenshell.open(temp_path)
-                os.remove(temp_path)
-                return self.process_ifc_file()
+                # Reruns and other sessions uploading the same file reuse its parse
+                self.current_file, extracted_data = parsed_ifc_upload(hashlib.sha256(file_data).hexdigest(), file_data)
+                return self.process_ifc_file(extracted_data)
             elif file_type == "json":
-                data = json.loads(file_data)
+                data = _json_loads(file_data)
                 self.current_file = data
                 return self.process_json_file()
             return False
@@ -724,67 +916,235 @@ class IFCAnalyzer:
             st.error(f"Error loading file: {str(e)}")
             return False
     
-    def process_ifc_file(self) -> bool:
-        """Process loaded IFC file and extract relevant information."""
+    @staticmethod
+    def _open_ifc(file_data):
+        """Parse IFC bytes in memory, falling back to a per-call temporary file."""
+        if hasattr(ifcopenshell.file, "from_string"):
+            # str() decodes any buffer, so an upload's getbuffer() view is parsed
+            # without first being copied out to a bytes object
+            return ifcopenshell.file.from_string(str(file_data, "utf-8", "replace"))
+        # Older ifcopenshell builds can only open paths; a unique name keeps
+        # concurrent sessions from overwriting each other's upload
+        with tempfile.NamedTemporaryFile(suffix=".ifc", delete=False) as f:
+            f.write(file_data)
+            temp_path = f.name
+        try:
+            return ifcopenshell.open(temp_path)
+        finally:
+            os.remove(temp_path)
+
+    def process_ifc_file(self, extracted_data: Optional[Dict[str, List[Dict[str, Any]]]] = None) -> bool:
+        """Process loaded IFC file and extract relevant information, unless extracted_data already holds it."""
         try:
             self.extracted_data = {}
-            
-            # Process each IFC entity type we're interested in
-            for entity_type in self.ifc_schema.keys():
-                entities = self.current_file.by_type(entity_type)
-                self.extracted_data[entity_type] = []
-                
-                for entity in entities:
-                    entity_data = {
-                        "GlobalId": entity.GlobalId,
-                        "Name": entity.Name if hasattr(entity, "Name") else None,
-                        "Description": entity.Description if hasattr(entity, "Description") else None,
-                        "Properties": {},
-                        "Quantities": {},
-                        "Relationships": []
-                    }
-                    
-                    # Extract properties
-                    if hasattr(entity, "IsDefinedBy"):
-                        for definition in entity.IsDefinedBy:
-                            if definition.is_a("IfcRelDefinesByProperties"):
-                                props = definition.RelatingPropertyDefinition
-                                if props.is_a("IfcPropertySet"):
-                                    for prop in props.HasProperties:
-                                        if hasattr(prop, "NominalValue"):
-                                            entity_data["Properties"][prop.Name] = prop.NominalValue.wrappedValue
-                    
-                    # Extract quantities
-                    if hasattr(entity, "IsDefinedBy"):
-                        for definition in entity.IsDefinedBy:
-                            if definition.is_a("IfcRelDefinesByProperties"):
-                                props = definition.RelatingPropertyDefinition
-                                if props.is_a("IfcElementQuantity"):
-                                    for quantity in props.Quantities:
-                                        if hasattr(quantity, "LengthValue"):
-                                            entity_data["Quantities"][quantity.Name] = quantity.LengthValue
-                                        elif hasattr(quantity, "AreaValue"):
-                                            entity_data["Quantities"][quantity.Name] = quantity.AreaValue
-                                        elif hasattr(quantity, "VolumeValue"):
-                                            entity_data["Quantities"][quantity.Name] = quantity.VolumeValue
-                    
-                    # Extract relationships
-                    if hasattr(entity, "ContainedInStructure"):
-                        for rel in entity.ContainedInStructure:
-                            if rel.is_a("IfcRelContainedInSpatialStructure"):
-                                entity_data["Relationships"].append({
-                                    "type": "ContainedIn",
-                                    "related_object": rel.RelatingStructure.is_a(),
-                                    "related_name": rel.RelatingStructure.Name if hasattr(rel.RelatingStructure, "Name") else None
-                                })
-                    
-                    self.extracted_data[entity_type].append(entity_data)
-            
+            if extracted_data is None:
+                extracted_data = self.extract_file_data(self.current_file)
+            self.extracted_data = extracted_data
+            self._build_search_index()
             return len(self.extracted_data) > 0
         except Exception as e:
             st.error(f"Error processing IFC file: {str(e)}")
             return False
     
+    @classmethod
+    def extract_file_data(cls, ifc_file) -> Dict[str, List[Dict[str, Any]]]:
+        """Extract the schema entity types present in an opened IFC file, keyed by entity type."""
+        # Definition and containment relationships are usually shared by many
+        # entities, so each one is classified and read once per file
+        definitions = {}
+        containments = {}
+        
+        # Only types the file's schema version defines; by_type raises on the rest
+        # (e.g. IfcPipe, or IFC4-only types in an IFC2X3 file)
+        extracted = {}
+        for entity_type in _declared_entity_types(ifc_file.schema):
+            entities = cls._extract_entities(ifc_file, entity_type, definitions, containments)
+            # Types without instances are left out, so searches and the index
+            # build never visit them
+            if entities:
+                extracted[entity_type] = entities
+        return extracted
+
+    @classmethod
+    def _extract_entities(cls, ifc_file, entity_type: str, definitions: Dict, containments: Dict) -> List[Dict[str, Any]]:
+        """Extract properties, quantities and relationships for every entity of one IFC type."""
+        # Which attributes exist depends only on the entity type, so it is looked
+        # up in the schema once instead of probed on every entity
+        attributes = _entity_attribute_names(ifc_file.schema, entity_type)
+        has_name = "Name" in attributes
+        has_description = "Description" in attributes
+        has_definitions = "IsDefinedBy" in attributes
+        has_containment = "ContainedInStructure" in attributes
+
+        extracted = []
+        for entity in ifc_file.by_type(entity_type):
+            entity_data = {
+                "GlobalId": entity.GlobalId,
+                "Name": entity.Name if has_name else None,
+                "Description": entity.Description if has_description else None,
+                "Properties": {},
+                "Quantities": {},
+                "Relationships": []
+            }
+            
+            # Extract properties and quantities in a single pass over the definitions
+            for definition in entity.IsDefinedBy if has_definitions else ():
+                definition_id = definition.id()
+                read = definitions.get(definition_id)
+                if read is None:
+                    read = definitions[definition_id] = cls._read_definition(definition)
+                section, values = read
+                if section is not None:
+                    entity_data[section].update(values)
+            
+            # Extract relationships; entities in the same container share one
+            # read-only relationship record
+            for rel in entity.ContainedInStructure if has_containment else ():
+                rel_id = rel.id()
+                if rel_id not in containments:
+                    containments[rel_id] = cls._read_containment(rel)
+                relationship = containments[rel_id]
+                if relationship is not None:
+                    entity_data["Relationships"].append(relationship)
+            
+            extracted.append(entity_data)
+        return extracted
+
+    @classmethod
+    def _read_definition(cls, definition) -> Tuple[Optional[str], Dict[str, Any]]:
+        """Read a definition relationship as ("Properties" or "Quantities", values), or (None, {})."""
+        if definition.is_a("IfcRelDefinesByProperties"):
+            props = definition.RelatingPropertyDefinition
+            # Neither set type has subtypes, so one is_a() name decides both
+            kind = props.is_a()
+            if kind == "IfcPropertySet":
+                return "Properties", cls._read_property_set(props)
+            if kind == "IfcElementQuantity":
+                return "Quantities", cls._read_element_quantity(props)
+        return None, {}
+
+    @staticmethod
+    def _read_containment(rel) -> Optional[Dict[str, Any]]:
+        """Read a spatial containment relationship as a ContainedIn record, or None for other relationships."""
+        if not rel.is_a("IfcRelContainedInSpatialStructure"):
+            return None
+        structure = rel.RelatingStructure
+        return {
+            "type": "ContainedIn",
+            "related_object": sys.intern(structure.is_a()),
+            "related_name": getattr(structure, "Name", None)
+        }
+
+    @staticmethod
+    def _read_property_set(pset) -> Dict[str, Any]:
+        """Read the single values of an IfcPropertySet."""
+        values = {}
+        for prop in pset.HasProperties:
+            nominal_value = getattr(prop, "NominalValue", None)
+            if nominal_value is not None:
+                # ifcopenshell returns a new string per read; interning lets every set
+                # and entity sharing a name share one object
+                values[sys.intern(prop.Name)] = nominal_value.wrappedValue
+        return values
+
+    @classmethod
+    def _read_element_quantity(cls, quantity_set) -> Dict[str, Any]:
+        """Read the length, area and volume quantities of an IfcElementQuantity."""
+        values = {}
+        for quantity in quantity_set.Quantities:
+            value_attribute = cls._QUANTITY_VALUE_ATTRIBUTES.get(quantity.is_a())
+            if value_attribute is not None:
+                values[sys.intern(quantity.Name)] = getattr(quantity, value_attribute)
+        return values
+
+    def _build_search_index(self):
+        """Index extracted entities by the components their types name and by dimension-like properties."""
+        # e.g. "stair" -> {"IfcStair", "IfcStairFlight"}, so a search filters entity
+        # types with set lookups instead of substring scans
+        self._types_by_component = {
+            comp_type: frozenset(
+                entity_type for entity_type in self.extracted_data if comp_type in entity_type.lower()
+            )
+            for comp_type in self.component_types
+        }
+        # Dimension-like property values in one column, entity by entity, so a
+        # numerical pattern is compared against all of them at once
+        dimension_rows = []
+        self._dimension_names = []
+        self._dimension_values = []
+        for entity_row, entity in enumerate(
+            entity for entities in self.extracted_data.values() for entity in entities
+        ):
+            for prop_name, value in entity["Properties"].items():
+                if _is_dimension_property(prop_name):
+                    dimension_rows.append(entity_row)
+                    self._dimension_names.append(prop_name)
+                    self._dimension_values.append(value)
+        self._dimension_rows = np.array(dimension_rows, dtype=np.intp)
+        self._dimension_array = np.array([
+            value if isinstance(value, (int, float)) else np.nan for value in self._dimension_values
+        ], dtype=np.float64)
+
+        # TF-IDF over each entity's type, name and property/quantity names, used to
+        # rank matches by relevance to the query
+        docs = [
+            " ".join(map(_split_camel_case, [
+                entity_type,
+                entity["Name"] or "",
+                *entity["Properties"].keys(),
+                *entity["Quantities"].keys()
+            ]))
+            for entity_type, entities in self.extracted_data.items()
+            for entity in entities
+        ]
+        self._entity_rows = {}
+        row = 0
+        for entity_type, entities in self.extracted_data.items():
+            self._entity_rows[entity_type] = row
+            row += len(entities)
+
+        # Which entities carry which property names, so property-based requirement
+        # filters become column lookups instead of per-entity dict scans
+        self._prop_ids = {}
+        rows, cols = [], []
+        for entity_row, entity in enumerate(
+            entity for entities in self.extracted_data.values() for entity in entities
+        ):
+            for prop_name in entity["Properties"]:
+                rows.append(entity_row)
+                cols.append(self._prop_ids.setdefault(prop_name, len(self._prop_ids)))
+        # e.g. "thermal" -> {"ThermalTransmittance"}, so performance requirements are
+        # set lookups instead of substring scans over every property name
+        prop_names_lower = [(prop_name, prop_name.lower()) for prop_name in self._prop_ids]
+        self._props_by_metric = {
+            metric: frozenset(name for name, name_lower in prop_names_lower if metric in name_lower)
+            for metric in self.attribute_keywords["performance"]["metrics"]
+        }
+        self._prop_presence = csr_matrix(
+            (np.ones(len(rows), dtype=bool), (rows, cols)), shape=(row, len(self._prop_ids))
+        )
+        if docs:
+            # Only the IDF weights are fitted per file; term counts come from the
+            # stateless hasher, so no vocabulary dict is built for each upload
+            from sklearn.feature_extraction.text import TfidfTransformer
+            counts = _entity_hasher().transform(docs)
+            self._tfidf = TfidfTransformer(sublinear_tf=True)
+            self._entity_matrix = self._tfidf.fit_transform(counts)
+            # Hashed columns that occur in some entity; query terms outside them are
+            # dropped, as a fitted vocabulary would drop unknown words
+            self._entity_terms = np.asarray(counts.getnnz(axis=0) > 0, dtype=np.float32)
+        else:
+            # No documents; the hasher cannot transform an empty batch
+            self._tfidf = None
+            self._entity_matrix = None
+            self._entity_terms = None
+
+        self._property_tables = {}
+        # Results depend only on the query and the indexed entities, so a rerun
+        # repeating a search is answered without scanning them again
+        self._search_results = lru_cache(maxsize=256)(self._search_components)
+        self._indexed_data = self.extracted_data
+
     def process_json_file(self) -> bool:
         """Process loaded JSON file and extract relevant information."""
         try:
@@ -801,21 +1161,19 @@ class IFCAnalyzer:
         Enhanced query preprocessing with advanced NLP and pattern recognition
         """
         # Process with spaCy for advanced NLP
-        doc = self.nlp(query.lower())
+        doc = self._parse_query(query.lower())
         
         # Extract components and their variations
         components = []
         for token in doc:
-            for comp_type, variations in self.component_types.items():
-                if token.text in variations or token.lemma_ in variations:
-                    components.append(comp_type)
+            components.extend(self._named_by(token, self._component_index))
         
         # Extract numerical values with units and comparators
         numerical_patterns = []
         for token in doc:
             if token.like_num:
                 next_token = token.nbor() if token.i + 1 < len(doc) else None
-                if next_token and next_token.text in sum([kw["units"] for kw in self.attribute_keywords.values()], []):
+                if next_token and next_token.text in self._unit_terms:
                     numerical_patterns.append({
                         "value": float(token.text),
                         "unit": next_token.text,
@@ -841,19 +1199,13 @@ class IFCAnalyzer:
         
         for token in doc:
             # Check material requirements
-            for material in self.attribute_keywords["material"]["types"]:
-                if token.text == material or token.lemma_ == material:
-                    requirements["material"].append(material)
+            requirements["material"].extend(self._named_by(token, self._material_index))
             
             # Check performance requirements
-            for metric in self.attribute_keywords["performance"]["metrics"]:
-                if token.text == metric or token.lemma_ == metric:
-                    requirements["performance"].append(metric)
+            requirements["performance"].extend(self._named_by(token, self._metric_index))
             
             # Check relationships
-            for rel_type in self.relationship_mapping:
-                if token.text == rel_type or token.lemma_ == rel_type:
-                    requirements["relationship"].append(rel_type)
+            requirements["relationship"].extend(self._named_by(token, self._relationship_index))
         
         return components, {
             "numerical_patterns": numerical_patterns,
@@ -862,11 +1214,17 @@ class IFCAnalyzer:
             "entities": [ent.text for ent in doc.ents]
         }
     
+    @staticmethod
+    def _named_by(token, index) -> List[str]:
+        """Values an inverted index gives for a token's text or lemma, in rank order."""
+        named = {index.get(token.text), index.get(token.lemma_)}
+        named.discard(None)
+        return [value for _, value in sorted(named)]
+
     def _find_comparator(self, doc, num_index: int) -> str:
         """Find comparison operators before a number"""
-        comparators = sum([kw["comparators"] for kw in self.attribute_keywords.values() if "comparators" in kw], [])
         for i in range(max(0, num_index - 3), num_index):
-            if doc[i].text in comparators:
+            if doc[i].text in self._comparator_terms:
                 return doc[i].text
         return "equal to"
     
@@ -875,38 +1233,83 @@ class IFCAnalyzer:
         related = []
         for i, token in enumerate(doc):
             if i != rel_index:
-                for comp_type, variations in self.component_types.items():
-                    if token.text in variations or token.lemma_ in variations:
-                        related.append({
-                            "type": comp_type,
-                            "position": "before" if i < rel_index else "after"
-                        })
+                for comp_type in self._named_by(token, self._component_index):
+                    related.append({
+                        "type": comp_type,
+                        "position": "before" if i < rel_index else "after"
+                    })
         return related
     
-    def search_components(self, query: str) -> List[Dict[str, Any]]:
+    def _entities_with_properties(self, prop_names) -> np.ndarray:
+        """Boolean mask over entity rows that have at least one of the given properties."""
+        cols = [self._prop_ids[name] for name in prop_names if name in self._prop_ids]
+        return self._prop_presence[:, cols].getnnz(axis=1) > 0
+
+    def search_components(self, query: str, top_k: int = 100) -> List[Dict[str, Any]]:
         """
-        Enhanced component search with advanced filtering and relationship analysis
+        Enhanced component search with advanced filtering and relationship analysis,
+        returning at most the top_k best matches
         """
+        if self._indexed_data is not self.extracted_data:
+            self._build_search_index()
+        return list(self._search_results(query, top_k))
+
+    def _search_components(self, query: str, top_k: int) -> Tuple[Dict[str, Any], ...]:
+        """Run search_components against the current search index."""
         components, query_info = self.preprocess_query(query)
-        results = []
+        # (match_score, relevance, entity_type, entity, match_details) per match;
+        # result dicts are only built for the ones that make the top_k
+        matches = []
+
+        # Entity types named by the query's components; None searches every type
+        wanted_types = None
+        if components:
+            wanted_types = frozenset().union(*(self._types_by_component[comp] for comp in components))
+
+        # Cosine relevance of every entity to the query (rows are L2-normalized)
+        relevance = None
+        if self._tfidf is not None:
+            query_counts = csr_matrix(_entity_hasher().transform([query.lower()]).multiply(self._entity_terms))
+            query_counts.eliminate_zeros()  # masked-out terms would become log(0) under sublinear tf
+            query_vector = self._tfidf.transform(query_counts)
+            relevance = (self._entity_matrix @ query_vector.T).toarray().ravel()
+
+        # Entities that can possibly satisfy the property-based requirements;
+        # the rest are skipped without calling _check_requirements
+        requirement_masks = {}
+        if query_info["requirements"]["material"]:
+            requirement_masks["material"] = self._entities_with_properties(["Material"])
+        performance = query_info["requirements"]["performance"]
+        if performance:
+            requirement_masks["performance"] = self._entities_with_properties(
+                frozenset().union(*(self._props_by_metric.get(value, ()) for value in performance))
+            )
+        
+        # Dimension values matching each numerical pattern, grouped by entity row
+        # in pattern order
+        numerical_hits = {}
+        for pattern in query_info["numerical_patterns"]:
+            for j in np.flatnonzero(self._numerical_matches(pattern)).tolist():
+                numerical_hits.setdefault(int(self._dimension_rows[j]), []).append((j, pattern))
         
         # Search through extracted data
         for entity_type, entities in self.extracted_data.items():
             # Check if entity type matches requested components
-            if not components or any(comp in entity_type.lower() for comp in components):
-                for entity in entities:
+            if wanted_types is None or entity_type in wanted_types:
+                first_row = self._entity_rows[entity_type]
+                for i, entity in enumerate(entities):
                     # Initialize match score
                     match_score = 0
                     match_details = {}
                     
                     # Check numerical patterns
-                    for pattern in query_info["numerical_patterns"]:
-                        for prop_name, value in entity["Properties"].items():
-                            if any(term in prop_name.lower() for term in self.attribute_keywords["dimension"]["terms"]):
-                                match = self._check_numerical_match(value, pattern)
-                                if match["matches"]:
-                                    match_score += 1
-                                    match_details[prop_name] = match
+                    for j, pattern in numerical_hits.get(first_row + i, ()):
+                        match_score += 1
+                        match_details[self._dimension_names[j]] = {
+                            "matches": True,
+                            "value": self._dimension_values[j],
+                            "pattern": pattern
+                        }
                     
                     # Check spatial relations
                     for relation in query_info["spatial_relations"]:
@@ -918,47 +1321,54 @@ class IFCAnalyzer:
                     # Check requirements
                     for req_type, req_values in query_info["requirements"].items():
                         if req_values:
+                            mask = requirement_masks.get(req_type)
+                            if mask is not None and not mask[first_row + i]:
+                                continue
                             req_match = self._check_requirements(entity, req_type, req_values)
                             if req_match["matches"]:
                                 match_score += 1
                                 match_details[req_type] = req_match
                     
-                    # If component matches criteria, add to results
+                    # If component matches criteria, keep it as a candidate
                     if match_score > 0 or not query_info["numerical_patterns"]:
-                        result = {
-                            "type": entity_type,
-                            "id": entity["GlobalId"],
-                            "name": entity["Name"],
-                            "properties": entity["Properties"],
-                            "quantities": entity["Quantities"],
-                            "relationships": entity["Relationships"],
-                            "match_score": match_score,
-                            "match_details": match_details
-                        }
-                        results.append(result)
+                        matches.append((
+                            match_score,
+                            float(relevance[first_row + i]) if relevance is not None else 0.0,
+                            entity_type,
+                            entity,
+                            match_details
+                        ))
         
-        # Sort results by match score
-        results.sort(key=lambda x: x["match_score"], reverse=True)
-        return results
+        # Best matches by match score, then by text relevance to the query
+        top_matches = heapq.nlargest(top_k, matches, key=lambda match: (match[0], match[1]))
+        return tuple(
+            {
+                "type": entity_type,
+                "id": entity["GlobalId"],
+                "name": entity["Name"],
+                "properties": entity["Properties"],
+                "quantities": entity["Quantities"],
+                "relationships": entity["Relationships"],
+                "match_score": match_score,
+                "relevance": entity_relevance,
+                "match_details": match_details
+            }
+            for match_score, entity_relevance, entity_type, entity, match_details in top_matches
+        )
     
-    def _check_numerical_match(self, value: float, pattern: Dict[str, Any]) -> Dict[str, Any]:
-        """Check if a value matches a numerical pattern"""
+    def _numerical_matches(self, pattern: Dict[str, Any]) -> np.ndarray:
+        """Which dimension values match a numerical pattern"""
+        values = self._dimension_array
         if pattern["comparator"] == "greater than":
-            matches = value > pattern["value"]
+            return values > pattern["value"]
         elif pattern["comparator"] == "less than":
-            matches = value < pattern["value"]
+            return values < pattern["value"]
         elif pattern["comparator"] == "at least":
-            matches = value >= pattern["value"]
+            return values >= pattern["value"]
         elif pattern["comparator"] == "at most":
-            matches = value <= pattern["value"]
+            return values <= pattern["value"]
         else:  # equal to
-            matches = abs(value - pattern["value"]) < 0.001
-        
-        return {
-            "matches": matches,
-            "value": value,
-            "pattern": pattern
-        }
+            return np.abs(values - pattern["value"]) < 0.001
     
     def _check_spatial_relation(self, entity: Dict[str, Any], relation: Dict[str, Any]) -> Dict[str, Any]:
         """Check if an entity satisfies a spatial relation"""
@@ -1003,8 +1413,9 @@ class IFCAnalyzer:
         
         elif req_type == "performance":
             for value in values:
+                metric_props = self._props_by_metric.get(value, ())
                 for prop_name, prop_value in entity["Properties"].items():
-                    if value in prop_name.lower():
+                    if prop_name in metric_props:
                         matches = True
                         details[value] = prop_value
         
@@ -1031,42 +1442,47 @@ class IFCAnalyzer:
         for result in results:
             with st.expander(f"{result['type']}: {result['name']} (Match Score: {result['match_score']})", expanded=True):
                 # Basic Information
-                st.markdown("### Basic Information")
-                st.write(f"- ID: {result['id']}")
-                st.write(f"- Type: {result['type']}")
+                st.markdown(f"### Basic Information\n- ID: {result['id']}\n- Type: {result['type']}")
                 
                 # Properties
                 if result['properties']:
                     st.markdown("### Properties")
-                    props_df = pd.DataFrame(
-                        [(k, v, self.property_units.get(k, "-")) 
-                         for k, v in result['properties'].items()],
-                        columns=["Property", "Value", "Unit"]
-                    )
-                    st.table(props_df)
+                    st.table(self._property_table(result))
                 
-                # Match Details
+                # Match Details (one markdown element rather than one per line)
                 if result['match_details']:
-                    st.markdown("### Match Details")
+                    blocks = ["### Match Details"]
                     for category, details in result['match_details'].items():
-                        st.write(f"**{category}:**")
+                        blocks.append(f"**{category}:**")
                         if isinstance(details, dict):
-                            for key, value in details.items():
-                                st.write(f"- {key}: {value}")
+                            blocks.append("\n".join(f"- {key}: {value}" for key, value in details.items()))
                         else:
-                            st.write(f"- {details}")
+                            blocks.append(f"- {details}")
+                    st.markdown("\n\n".join(block for block in blocks if block))
                 
                 # Relationships
                 if result['relationships']:
-                    st.markdown("### Relationships")
-                    for rel in result['relationships']:
-                        st.write(f"- {rel['type']} → {rel['related_name']}")
+                    st.markdown("### Relationships\n" + "\n".join(
+                        f"- {rel['type']} → {rel['related_name']}" for rel in result['relationships']
+                    ))
                 
                 # Code Compliance
                 if 'requirements' in result:
                     st.markdown("### Code Compliance")
                     self.display_compliance_status(result['requirements'])
 
+    def _property_table(self, result: Dict[str, Any]) -> pd.DataFrame:
+        """Build an entity's property/unit table once and reuse it across reruns."""
+        table = self._property_tables.get(result['id'])
+        if table is None:
+            names = list(result['properties'])
+            table = self._property_tables[result['id']] = pd.DataFrame({
+                "Property": names,
+                "Value": list(result['properties'].values()),
+                "Unit": list(map(self.property_units.get, names, repeat("-")))
+            })
+        return table
+
     def display_compliance_status(self, requirements: Dict[str, Any]):
         """
         Display component compliance status with building codes
@@ -1091,6 +1507,12 @@ class IFCAnalyzer:
                 </div>
             """, unsafe_allow_html=True)
 
+@st.cache_resource(show_spinner=False, max_entries=4)
+def parsed_ifc_upload(digest: str, _file_data) -> Tuple[Any, Dict[str, List[Dict[str, Any]]]]:
+    """Open and extract an uploaded IFC file once per process, keyed by the digest of its bytes."""
+    ifc_file = IFCAnalyzer._open_ifc(_file_data)
+    return ifc_file, IFCAnalyzer.extract_file_data(ifc_file)
+
 def main():
     st.set_page_config(
         page_title="Construction Code Reference",
@@ -1114,7 +1536,7 @@ def main():
         # Location selection with immediate requirements update
         location = st.selectbox(
             "Select Location",
-            options=list(st.session_state.analyzer.locations.keys()),
+            options=LOCATION_OPTIONS,
             index=0
         )
         st.session_state.analyzer.current_location = location
@@ -1132,17 +1554,9 @@ def main():
         )
         
         # Specific component selection based on category
-        component_options = {
-            "Structural Components": ["Beam", "Column", "Slab", "Wall (Structural)", "Foundation"],
-            "Architectural Elements": ["Wall (Partition)", "Door", "Window", "Stairs", "Railing"],
-            "MEP Systems": ["HVAC", "Plumbing", "Electrical", "Fire Protection"],
-            "Fire Safety": ["Fire Walls", "Fire Doors", "Sprinkler Systems", "Emergency Lighting"],
-            "Accessibility Features": ["Ramps", "Accessible Routes", "Restrooms", "Signage"]
-        }
-        
         specific_component = st.selectbox(
             "Select Specific Component",
-            options=component_options.get(component_category, [])
+            options=COMPONENT_OPTIONS.get(component_category, [])
         )
         
         # Additional filters
@@ -1174,17 +1588,14 @@ def main():
             # Dimensional Requirements Tab
             with tabs[0]:
                 st.subheader("Dimensional Requirements")
-                if specific_component in st.session_state.analyzer.ifc_schema:
-                    component_data = st.session_state.analyzer.ifc_schema[specific_component]
-                    if "requirements" in component_data:
-                        for name, req in component_data["requirements"].items():
-                            if any(dim in name.lower() for dim in ["height", "width", "depth", "thickness", "length"]):
-                                st.info(f"""
-                                **{name}**
-                                - Required Value: {req['value']}
-                                - Description: {req['description']}
-                                - Code Reference: {req['code_reference']}
-                                """)
+                requirements, dimensional = st.session_state.analyzer.get_component_requirements(specific_component)
+                for name, req in dimensional:
+                    st.info(f"""
+                    **{name}**
+                    - Required Value: {req['value']}
+                    - Description: {req['description']}
+                    - Code Reference: {req['code_reference']}
+                    """)
             
             # Material Specifications Tab
             with tabs[1]:
@@ -1199,12 +1610,7 @@ def main():
                 """)
                 
                 st.markdown("#### Material Properties")
-                material_df = pd.DataFrame({
-                    "Property": ["Compressive Strength", "Tensile Strength", "Fire Rating"],
-                    "Requirement": ["As specified", "Per design", "2 hours minimum"],
-                    "Test Method": ["ASTM C39", "ASTM A370", "UL 263"]
-                })
-                st.table(material_df)
+                st.table(MATERIAL_PROPERTIES)
             
             # Construction Details Tab
             with tabs[2]:
@@ -1234,16 +1640,13 @@ def main():
                 **Jurisdiction: {code_info['jurisdiction']}**
                 """)
                 
-                if specific_component in st.session_state.analyzer.ifc_schema:
-                    component_data = st.session_state.analyzer.ifc_schema[specific_component]
-                    if "requirements" in component_data:
-                        for name, req in component_data["requirements"].items():
-                            st.success(f"""
-                            #### {name}
-                            - **Requirement:** {req['value']}
-                            - **Description:** {req['description']}
-                            - **Code Reference:** {req['code_reference']}
-                            """)
+                for name, req in requirements:
+                    st.success(f"""
+                    #### {name}
+                    - **Requirement:** {req['value']}
+                    - **Description:** {req['description']}
+                    - **Code Reference:** {req['code_reference']}
+                    """)
             
             # Installation Guide Tab
             with tabs[4]: